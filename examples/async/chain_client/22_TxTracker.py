@@ -0,0 +1,82 @@
+# Copyright 2021 Injective Labs
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Injective Chain Tx/Query client for Python. Example only."""
+
+import asyncio
+import logging
+
+from pyinjective.composer import Composer as ProtoMsgComposer
+from pyinjective.async_client import AsyncClient
+from pyinjective.transaction import Transaction
+from pyinjective.tx_tracker import TxTracker
+from pyinjective.constant import Network
+from pyinjective.wallet import PrivateKey, PublicKey, Address
+
+
+async def main() -> None:
+    # select network: local, testnet, mainnet
+    network = Network.testnet()
+    composer = ProtoMsgComposer(network=network.string())
+
+    # initialize grpc client
+    client = AsyncClient(network, insecure=True)
+
+    # load account
+    priv_key = PrivateKey.from_hex("f9db9bf330e23cb7839039e944adef6e9df447b90b503d5b4464c90bea9022f3")
+    pub_key = priv_key.to_public_key()
+    address = await pub_key.to_address().async_init_num_seq(network.lcd_endpoint)
+
+    # prepare tx msg
+    msg = composer.MsgSend(
+        from_address=address.to_acc_bech32(),
+        to_address='inj1hkhdaj2a2clmq5jq6mspsggqs32vynpk228q3r',
+        amount=0.000000000000000001,
+        denom='INJ'
+    )
+
+    # build tx
+    gas_price = 500000000
+    gas_limit = 200000
+    fee = [composer.Coin(
+        amount=gas_price * gas_limit,
+        denom=network.fee_denom,
+    )]
+    tx = (
+        Transaction()
+        .with_messages(msg)
+        .with_sequence(address.get_sequence())
+        .with_account_num(address.get_number())
+        .with_chain_id(network.chain_id)
+        .with_gas(gas_limit)
+        .with_fee(fee)
+    )
+    sign_doc = tx.get_sign_doc(pub_key)
+    sig = priv_key.sign(sign_doc.SerializeToString())
+    tx_raw_bytes = tx.get_tx_data(sig, pub_key)
+
+    # broadcast in sync mode and wait for inclusion on the explorer tx stream
+    async with TxTracker(client) as tracker:
+        included = await tracker.broadcast(tx_raw_bytes)
+        res = await asyncio.wait_for(included, timeout=30)
+        # inclusion alone is not success: a tx failing in DeliverTx is included too
+        if res.code != 0:
+            print("tx included in block", res.block_number, "but failed with code", res.code, res.codespace, res.info)
+            return
+        res_msg = ProtoMsgComposer.MsgResponses(res.data, simulation=True)
+        print("tx included in block", res.block_number)
+        print(res_msg)
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.get_event_loop().run_until_complete(main())
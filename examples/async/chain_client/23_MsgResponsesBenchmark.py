@@ -0,0 +1,54 @@
+# Copyright 2021 Injective Labs
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Injective Exchange API client for Python. Example only.
+
+Times Composer.MsgResponses on a large MsgBatchUpdateOrders result, from hex as returned
+by the chain and from the raw bytes of a simulation.
+"""
+
+import os
+import timeit
+
+from pyinjective.composer import Composer
+from pyinjective.proto.injective.exchange.v1beta1 import tx_pb2 as injective_exchange_tx_pb
+from pyinjective.proto.injective.types.v1beta1 import tx_response_pb2 as tx_response_pb
+
+ORDERS = 500
+
+
+def batch_update_result() -> bytes:
+    res = injective_exchange_tx_pb.MsgBatchUpdateOrdersResponse(
+        spot_cancel_success=[True] * ORDERS,
+        derivative_cancel_success=[True] * ORDERS,
+        spot_order_hashes=["0x" + os.urandom(32).hex() for _ in range(ORDERS)],
+        derivative_order_hashes=["0x" + os.urandom(32).hex() for _ in range(ORDERS)],
+    )
+    data = tx_response_pb.TxResponseData()
+    data.messages.add(header="/injective.exchange.v1beta1.MsgBatchUpdateOrders", data=res.SerializeToString())
+    return data.SerializeToString()
+
+
+def main() -> None:
+    raw = batch_update_result()
+    hex_data = raw.hex()
+    number = 2000
+    for name, fn in (
+        ("hex", lambda: Composer.MsgResponses(hex_data)),
+        ("bytes", lambda: Composer.MsgResponses(raw, simulation=True)),
+    ):
+        seconds = timeit.timeit(fn, number=number)
+        print("{:6s} {:.1f} us per decode ({} bytes)".format(name, seconds / number * 1e6, len(raw)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+# Copyright 2021 Injective Labs
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Injective Exchange API client for Python. Example only."""
+
+import asyncio
+import logging
+
+from pyinjective.async_client import AsyncClient
+from pyinjective.constant import Network
+from pyinjective.portfolio import PortfolioSnapshot
+
+async def main() -> None:
+    network = Network.testnet()
+    client = AsyncClient(network, insecure=True)
+    account_address = "inj14au322k9munkmx5wrchz9q30juf5wjgz2cfqku"
+    portfolio = await PortfolioSnapshot(client, account_address).build()
+    print(portfolio.balances.rows())
+    print(len(portfolio.orders), "orders,", len(portfolio.positions), "positions")
+
+    # only subaccounts whose balances moved are queried again
+    await portfolio.watch()
+    while True:
+        await asyncio.sleep(10)
+        print("reloaded", await portfolio.refresh())
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    asyncio.get_event_loop().run_until_complete(main())
@@ -0,0 +1,37 @@
+# Copyright 2021 Injective Labs
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Injective Exchange API client for Python. Example only."""
+
+import asyncio
+import logging
+
+from pyinjective.async_client import AsyncClient
+from pyinjective.constant import Network
+from pyinjective.position_tracker import PositionTracker
+
+async def main() -> None:
+    network = Network.testnet()
+    client = AsyncClient(network, insecure=True)
+    subaccount_id = "0xaf79152ac5df276d9a8e1e2e22822f9713474902000000000000000000000000"
+    market_ids = ["0x4ca0f92fc28be0c9761326016b5a1a2177dd6375558365116b5bdda9abc229ce"]
+    async with PositionTracker(client, subaccount_id, market_ids=market_ids) as tracker:
+        while True:
+            for risk in tracker.positions():
+                print(risk.market_id, risk.direction, risk.unrealized_pnl, risk.margin_ratio, risk.liquidation_distance)
+            print("total unrealized pnl", tracker.total_unrealized_pnl())
+            await asyncio.sleep(1)
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    asyncio.get_event_loop().run_until_complete(main())
@@ -0,0 +1,102 @@
+# Copyright 2021 Injective Labs
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Injective Exchange API client for Python. Example only.
+
+Measures event loop lag while decoding large orderbook messages on the loop and in a thread pool.
+Run with `--live` to also stream a market through AsyncClient with executor=...
+"""
+
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pyinjective.async_client import AsyncClient
+from pyinjective.constant import Network
+from pyinjective.decoding import OffloopStream
+from pyinjective.proto.exchange import injective_derivative_exchange_rpc_pb2 as derivative_exchange_rpc_pb
+
+MESSAGES = 200
+LEVELS = 5000
+
+
+def orderbook_bytes() -> bytes:
+    res = derivative_exchange_rpc_pb.StreamOrderbookResponse(market_id="0x" + "ab" * 32, operation_type="update", timestamp=1)
+    for i in range(LEVELS):
+        res.orderbook.buys.add(price=str(30000 - i), quantity="1.5", timestamp=i)
+        res.orderbook.sells.add(price=str(30001 + i), quantity="2.5", timestamp=i)
+    return res.SerializeToString()
+
+
+class RawCall:
+    """Stands in for a grpc stream call opened with an identity deserializer."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def __aiter__(self):
+        for _ in range(MESSAGES):
+            await asyncio.sleep(0.002)
+            yield self.data
+
+    def cancel(self):
+        pass
+
+
+async def inline(call):
+    async for data in call:
+        yield derivative_exchange_rpc_pb.StreamOrderbookResponse.FromString(data)
+
+
+async def loop_lag(done: asyncio.Event, samples: list):
+    # how late a 1ms timer fires is how long other coroutines would have waited
+    while not done.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        samples.append((time.perf_counter() - start - 0.001) * 1000)
+
+
+async def measure(name: str, stream) -> None:
+    done = asyncio.Event()
+    samples = []
+    ticker = asyncio.ensure_future(loop_lag(done, samples))
+    async for _ in stream:
+        pass
+    done.set()
+    await ticker
+    samples.sort()
+    print("{:8s} loop lag ms: median {:.2f} p99 {:.2f} max {:.2f}".format(
+        name, statistics.median(samples), samples[int(len(samples) * 0.99)], samples[-1]))
+
+
+async def main() -> None:
+    data = orderbook_bytes()
+    print("message size {} bytes".format(len(data)))
+    await measure("inline", inline(RawCall(data)))
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        await measure("thread", OffloopStream(RawCall(data), derivative_exchange_rpc_pb.StreamOrderbookResponse, executor))
+
+        if "--live" in sys.argv:
+            network = Network.testnet()
+            client = AsyncClient(network, insecure=True)
+            market_ids = ["0x4ca0f92fc28be0c9761326016b5a1a2177dd6375558365116b5bdda9abc229ce"]
+            stream = await client.stream_derivative_orderbooks(market_ids=market_ids, executor=executor)
+            async for orderbook in stream:
+                print(orderbook.market_id, len(orderbook.orderbook.buys), len(orderbook.orderbook.sells))
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    asyncio.get_event_loop().run_until_complete(main())
@@ -0,0 +1,62 @@
+# Copyright 2021 Injective Labs
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Injective Exchange API client for Python. Example only."""
+
+import asyncio
+import logging
+
+from pyinjective.composer import Composer as ProtoMsgComposer
+from pyinjective.async_client import AsyncClient
+from pyinjective.constant import Network
+from pyinjective.wallet import PrivateKey
+from pyinjective.proto.exchange import injective_exchange_rpc_pb2 as exchange_rpc_pb
+
+
+async def main() -> None:
+    network = Network.testnet()
+    composer = ProtoMsgComposer(network=network.string())
+    client = AsyncClient(network, insecure=True)
+
+    priv_key = PrivateKey.from_hex("f9db9bf330e23cb7839039e944adef6e9df447b90b503d5b4464c90bea9022f3")
+    address = await priv_key.to_public_key().to_address().async_init_num_seq(network.lcd_endpoint)
+
+    msg = composer.MsgSend(
+        from_address=address.to_acc_bech32(),
+        to_address='inj1hkhdaj2a2clmq5jq6mspsggqs32vynpk228q3r',
+        amount=0.000000000000000001,
+        denom='INJ'
+    )
+
+    gas_price = 500000000
+    gas_limit = 200000
+    fee = exchange_rpc_pb.CosmosTxFee(
+        price=[exchange_rpc_pb.CosmosCoin(denom=network.fee_denom, amount=str(gas_price))],
+        gas=gas_limit
+    )
+
+    # PrepareTx, sign the EIP-712 data and BroadcastTx through the exchange API
+    res = await client.send_tx_exchange_mode(
+        priv_key=priv_key,
+        # the EIP-712 chain id is the numeric suffix of the cosmos chain id, e.g. injective-888
+        chain_id=int(network.chain_id.rsplit("-", 1)[1]),
+        msgs=[msg],
+        sequence=address.get_sequence(),
+        fee=fee
+    )
+    print(res)
+    print(client.broadcast_latency, client.fastest_broadcast_route())
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    asyncio.get_event_loop().run_until_complete(main())
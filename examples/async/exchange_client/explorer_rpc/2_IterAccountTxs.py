@@ -0,0 +1,36 @@
+# Copyright 2021 Injective Labs
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Injective Exchange API client for Python. Example only."""
+
+import asyncio
+import logging
+
+from pyinjective.async_client import AsyncClient
+from pyinjective.constant import Network
+
+async def main() -> None:
+    network = Network.testnet()
+    client = AsyncClient(network, insecure=True)
+    address = "inj1phd706jqzd9wznkk5hgsfkrc8jqxv0kmlj0kex"
+    count = 0
+    # the next pages are fetched while this loop is still printing the current one
+    async for tx in client.iter_account_txs(address=address, page_size=50, prefetch=2):
+        print(tx.block_number, tx.hash, tx.tx_type)
+        count += 1
+        if count >= 500:
+            break
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    asyncio.get_event_loop().run_until_complete(main())
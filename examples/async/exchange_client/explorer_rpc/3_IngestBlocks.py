@@ -0,0 +1,45 @@
+# Copyright 2021 Injective Labs
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Injective Exchange API client for Python. Example only."""
+
+import asyncio
+import logging
+
+from pyinjective.async_client import AsyncClient
+from pyinjective.constant import Network
+from pyinjective.ingestion import ExplorerIngestor, ExplorerStore
+
+async def main() -> None:
+    network = Network.testnet()
+    client = AsyncClient(network, insecure=True)
+    # rerunning resumes from the heights already stored
+    store = ExplorerStore("explorer.db")
+    latest = (await client.get_blocks(limit=1)).data[0].height
+    ingestor = ExplorerIngestor(client, store, start_height=latest - 1000, chunk_size=50, concurrency=4)
+
+    result = await ingestor.backfill()
+    print("backfilled", len(result.results), "chunks,", len(result.errors), "failed")
+    print("ingested ranges:", store.ingested_ranges())
+
+    # follow live blocks for a minute
+    try:
+        await asyncio.wait_for(ingestor.run(), timeout=60)
+    except asyncio.TimeoutError:
+        pass
+    print("ingested ranges:", store.ingested_ranges())
+    store.close()
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    asyncio.get_event_loop().run_until_complete(main())
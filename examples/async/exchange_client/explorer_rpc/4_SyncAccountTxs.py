@@ -0,0 +1,42 @@
+# Copyright 2021 Injective Labs
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Injective Exchange API client for Python. Example only."""
+
+import asyncio
+import logging
+
+from pyinjective.account_sync import AccountTxStore, AccountTxSyncer
+from pyinjective.async_client import AsyncClient
+from pyinjective.constant import Network
+
+async def main() -> None:
+    network = Network.testnet()
+    client = AsyncClient(network, insecure=True)
+    addresses = ["inj14au322k9munkmx5wrchz9q30juf5wjgz2cfqku"]
+    # the first run fetches the full history, later runs only what is newer than the checkpoints
+    store = AccountTxStore("account_txs.db")
+    syncer = AccountTxSyncer(client, store, concurrency=8)
+    result = await syncer.sync(addresses)
+    for address in addresses:
+        if address in result.errors:
+            print(address, "failed:", result.errors[address])
+            continue
+        print(address, result.results[address], "new txs, checkpoint", store.checkpoint(address))
+        for tx in store.history(address, limit=5):
+            print("  ", tx.block_number, tx.hash, tx.tx_type)
+    store.close()
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    asyncio.get_event_loop().run_until_complete(main())
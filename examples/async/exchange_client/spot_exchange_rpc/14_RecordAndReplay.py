@@ -0,0 +1,42 @@
+# Copyright 2021 Injective Labs
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Injective Exchange API client for Python. Example only."""
+
+import asyncio
+import logging
+
+from pyinjective.async_client import AsyncClient
+from pyinjective.constant import Network
+from pyinjective.recorder import StreamRecorder, StreamReplay
+
+async def main() -> None:
+    network = Network.testnet()
+    client = AsyncClient(network, insecure=True)
+    market_ids = ["0xa508cb32923323679f29a032c70342c147c17d0145625922b0ef22e955c844c0"]
+
+    # record 100 orderbook updates
+    with StreamRecorder("recordings", "spot_orderbook") as recorder:
+        orderbooks = await client.stream_spot_orderbooks(market_ids=market_ids)
+        async for orderbook in recorder.record_stream(orderbooks):
+            if recorder.count == 100:
+                orderbooks.cancel()
+                break
+
+    # replay them ten times faster than they were received
+    async for orderbook in StreamReplay("recordings", "spot_orderbook", speed=10.0):
+        print(orderbook.market_id, orderbook.timestamp)
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    asyncio.get_event_loop().run_until_complete(main())
@@ -0,0 +1,37 @@
+# Copyright 2021 Injective Labs
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Injective Exchange API client for Python. Example only."""
+
+import asyncio
+import logging
+
+from pyinjective.async_client import AsyncClient
+from pyinjective.constant import Network
+
+def report(name: str, metrics: dict) -> None:
+    staleness = metrics["staleness_ms"]
+    print(name, metrics["messages"], "messages, staleness p50", staleness["p50"], "p99", staleness["p99"],
+          "decode p99", metrics["decode_ms"]["p99"])
+
+async def main() -> None:
+    network = Network.testnet()
+    client = AsyncClient(network, insecure=True)
+    market_id = "0xa508cb32923323679f29a032c70342c147c17d0145625922b0ef22e955c844c0"
+    trades = await client.stream_spot_trades(market_id=market_id, metrics_callback=report, metrics_interval=30)
+    async for trade in trades:
+        print(trade.trade.order_hash, trade.trade.price.price)
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    asyncio.get_event_loop().run_until_complete(main())
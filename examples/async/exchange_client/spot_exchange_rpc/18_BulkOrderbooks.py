@@ -0,0 +1,34 @@
+# Copyright 2021 Injective Labs
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Injective Exchange API client for Python. Example only."""
+
+import asyncio
+import logging
+
+from pyinjective.async_client import AsyncClient
+from pyinjective.constant import Network
+
+async def main() -> None:
+    network = Network.testnet()
+    client = AsyncClient(network, insecure=True)
+    # every active spot market, at most 16 requests in flight
+    bulk = await client.get_spot_orderbooks_bulk(concurrency=16)
+    for market_id, res in bulk.results.items():
+        print(market_id, len(res.orderbook.buys), len(res.orderbook.sells), "{:.0f}ms".format(bulk.latency[market_id] * 1000))
+    for market_id, err in bulk.errors.items():
+        print(market_id, "failed:", err)
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    asyncio.get_event_loop().run_until_complete(main())
@@ -0,0 +1,42 @@
+# Copyright 2021 Injective Labs
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Injective Exchange API client for Python. Example only."""
+
+import asyncio
+import logging
+
+from pyinjective.async_client import AsyncClient
+from pyinjective.constant import Network
+from pyinjective.indexer_lag import IndexerLagMonitor, chain_levels
+
+async def main() -> None:
+    network = Network.testnet()
+    client = AsyncClient(network, insecure=True)
+    market_id = "0xa508cb32923323679f29a032c70342c147c17d0145625922b0ef22e955c844c0"
+
+    # the same book read from the exchange module directly
+    res = await client.get_chain_spot_orderbook(market_id, limit=5)
+    bids, asks = chain_levels(res, depth=5)
+    print("chain best bid", bids[:1], "best ask", asks[:1])
+
+    monitor = IndexerLagMonitor(client, spot_market_ids=[market_id], interval=5, depth=5, timeout=10)
+    monitor.start()
+    for _ in range(6):
+        await asyncio.sleep(5)
+        print(monitor.to_dict())
+    await monitor.stop()
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    asyncio.get_event_loop().run_until_complete(main())
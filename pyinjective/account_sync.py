@@ -0,0 +1,140 @@
+"""Incremental GetAccountTxs sync into a local SQLite history."""
+
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional
+
+from .bulk import BulkResult, gather_bounded
+from .pagination import paginate
+from .proto.exchange import injective_explorer_rpc_pb2 as explorer_rpc_pb
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS account_txs (
+    address TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    block_number INTEGER,
+    block_timestamp TEXT,
+    code INTEGER,
+    tx_type TEXT,
+    raw BLOB,
+    PRIMARY KEY (address, hash)
+);
+CREATE INDEX IF NOT EXISTS account_txs_block_number ON account_txs (address, block_number);
+CREATE TABLE IF NOT EXISTS account_checkpoints (
+    address TEXT PRIMARY KEY,
+    block_number INTEGER NOT NULL,
+    synced_at REAL NOT NULL
+);
+"""
+
+
+class AccountTxStore:
+    """
+    SQLite history of account transactions, indexed by address and block.
+
+    :param path: database file, or ":memory:"; may be shared with an ExplorerStore
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def checkpoint(self, address: str) -> Optional[int]:
+        """Newest block seen for ``address``, None before its first sync."""
+        row = self.conn.execute("SELECT block_number FROM account_checkpoints WHERE address = ?", (address,)).fetchone()
+        return row[0] if row else None
+
+    def checkpoints(self) -> Dict[str, int]:
+        return dict(self.conn.execute("SELECT address, block_number FROM account_checkpoints"))
+
+    def write(self, address: str, txs: List[explorer_rpc_pb.TxData], block_number: int) -> int:
+        """Store ``txs`` and move the checkpoint of ``address`` to ``block_number``; returns the new rows."""
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO account_txs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (address, t.hash, t.block_number, t.block_timestamp, t.code, t.tx_type, t.SerializeToString())
+                    for t in txs
+                ],
+            )
+            added = self.conn.total_changes - before
+            self.conn.execute(
+                "INSERT OR REPLACE INTO account_checkpoints VALUES (?, ?, ?)", (address, block_number, time.time()))
+        return added
+
+    def history(
+        self,
+        address: str,
+        after: int = None,
+        before: int = None,
+        tx_type: str = None,
+        limit: int = None,
+    ) -> List[explorer_rpc_pb.TxData]:
+        """Stored transactions of ``address``, newest first, optionally within blocks (after, before)."""
+        query = "SELECT raw FROM account_txs WHERE address = ?"
+        args = [address]
+        if after is not None:
+            query += " AND block_number > ?"
+            args.append(after)
+        if before is not None:
+            query += " AND block_number < ?"
+            args.append(before)
+        if tx_type is not None:
+            query += " AND tx_type = ?"
+            args.append(tx_type)
+        query += " ORDER BY block_number DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            args.append(limit)
+        return [explorer_rpc_pb.TxData.FromString(raw) for raw, in self.conn.execute(query, args)]
+
+    def count(self, address: str) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM account_txs WHERE address = ?", (address,)).fetchone()[0]
+
+
+class AccountTxSyncer:
+    """
+    Brings the AccountTxStore up to date for many addresses at once.
+
+    :param client: the AsyncClient to query the explorer with
+    :param store: AccountTxStore to write to
+    :param concurrency: addresses synced at the same time
+    :param page_size: transactions per GetAccountTxs request
+    :param prefetch: pages requested ahead per address, see pagination.paginate; incremental
+        syncs usually fit one page, so none by default
+    """
+
+    def __init__(self, client, store: AccountTxStore, concurrency: int = 8, page_size: int = 100, prefetch: int = 0):
+        self.client = client
+        self.store = store
+        self.concurrency = concurrency
+        self.page_size = page_size
+        self.prefetch = prefetch
+
+    async def sync_address(self, address: str) -> int:
+        """Fetch the transactions of ``address`` newer than its checkpoint; returns how many were new."""
+        checkpoint = self.store.checkpoint(address)
+        kwargs = {}
+        if checkpoint is not None:
+            kwargs["after"] = max(checkpoint - 1, 0)
+
+        async def fetch_page(skip: int, limit: int):
+            res = await self.client.get_account_txs(address, skip=skip, limit=limit, **kwargs)
+            return res.data
+
+        txs = []
+        async for tx in paginate(fetch_page, self.page_size, self.prefetch, key=lambda tx: tx.hash):
+            if checkpoint is None or tx.block_number >= checkpoint:
+                txs.append(tx)
+        newest = max([tx.block_number for tx in txs] + [checkpoint or 0])
+        return self.store.write(address, txs, newest)
+
+    async def sync(self, addresses: Iterable[str]) -> BulkResult:
+        """Sync every address; failed ones keep their checkpoint and are reported in the errors."""
+        return await gather_bounded(self.sync_address, addresses, self.concurrency)
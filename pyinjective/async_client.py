@@ -1,9 +1,22 @@
 import os
+import json
+import hashlib
 import time
+import asyncio
+import functools
 import grpc
 from typing import List, Optional, Tuple, Union
 
+from google.protobuf import json_format, message
+
+from .bulk import BulkResult, gather_bounded
+from .composer import Composer
+from .decoding import open_offloop_stream, stream_method
 from .exceptions import NotFoundError, EmptyMsgError
+from .metrics import LatencyStats, StreamMetrics, fastest
+from .orderbook import dec_to_int
+from .pagination import paginate
+from .streams import ConflatingStream, ResilientStream, StreamHub
 
 from .proto.cosmos.base.abci.v1beta1 import abci_pb2 as abci_type
 
@@ -25,6 +38,10 @@ from .proto.cosmos.tx.v1beta1 import (
     service_pb2_grpc as tx_service_grpc,
     service_pb2 as tx_service,
 )
+from .proto.injective.exchange.v1beta1 import (
+    query_pb2_grpc as chain_exchange_query_grpc,
+    query_pb2 as chain_exchange_query,
+)
 from .proto.exchange import (
     injective_accounts_rpc_pb2 as exchange_accounts_rpc_pb,
     injective_accounts_rpc_pb2_grpc as exchange_accounts_rpc_grpc,
@@ -41,10 +58,13 @@ from .proto.exchange import (
     injective_explorer_rpc_pb2 as explorer_rpc_pb,
     injective_explorer_rpc_pb2_grpc as explorer_rpc_grpc,
     injective_auction_rpc_pb2 as auction_rpc_pb,
-    injective_auction_rpc_pb2_grpc as auction_rpc_grpc
+    injective_auction_rpc_pb2_grpc as auction_rpc_grpc,
+    injective_exchange_rpc_pb2 as exchange_rpc_pb,
+    injective_exchange_rpc_pb2_grpc as exchange_rpc_grpc
 )
 
 from .constant import Network
+from .wallet import PrivateKey
 
 TIMEOUT = int(os.environ.get('INJ_GRPC_TIMEOUT') or 8)
 
@@ -67,12 +87,79 @@ class UnaryUnaryWithTimeout(grpc.aio.UnaryUnaryClientInterceptor):
         return await continuation(new_details, request)
 
 
+ETHSECP256K1_PUBKEY_TYPE = "/injective.crypto.v1beta1.ethsecp256k1.PubKey"
+
+
+def _msg_to_web3_json(msg: message.Message) -> bytes:
+    # the exchange API takes msgs as proto3 JSON tagged with their type url
+    msg_dict = json_format.MessageToDict(msg, preserving_proto_field_name=True)
+    msg_dict["@type"] = "/" + msg.DESCRIPTOR.full_name
+    return json.dumps(msg_dict).encode()
+
+
+# cosmos-sdk ErrTxInMempoolCache
+TX_IN_MEMPOOL_CODE = 19
+
+
+def _is_tx_in_mempool(log: str, code: int = None, codespace: str = None) -> bool:
+    # code 19 is ErrTxInMempoolCache only in the sdk codespace, other modules reuse the number
+    if code == TX_IN_MEMPOOL_CODE and codespace == "sdk":
+        return True
+    return "tx already in mempool" in log or "tx already exists in cache" in log
+
+
+def _retrieve_exception(task: asyncio.Future):
+    # losing race broadcasts finish in the background; consume their errors
+    if not task.cancelled():
+        task.exception()
+
+
+def _order_removal(msg):
+    # filled or cancelled while disconnected, which of the two is unknown
+    removal = type(msg)()
+    removal.CopyFrom(msg)
+    removal.operation_type = "delete"
+    removal.order.unfilled_quantity = "0"
+    return removal
+
+
+def _is_order_removal(msg) -> bool:
+    return msg.operation_type == "delete" or msg.order.state in ("filled", "canceled")
+
+
+def _position_removal(msg):
+    removal = type(msg)()
+    removal.CopyFrom(msg)
+    removal.position.quantity = "0"
+    return removal
+
+
+def _is_position_removal(msg) -> bool:
+    return dec_to_int(msg.position.quantity or "0") == 0
+
+
+def _chain_market_status(market_status: Optional[str]) -> Optional[str]:
+    # the exchange API uses "active", the exchange module the MarketStatus name "Active"
+    return market_status.capitalize() if market_status else None
+
+
+# trades carry no id; an order fills at most once per price and quantity at a time
+def _spot_trade_key(trade) -> tuple:
+    return trade.order_hash, trade.executed_at, trade.price.price, trade.price.quantity
+
+
+def _derivative_trade_key(trade) -> tuple:
+    delta = trade.position_delta
+    return trade.order_hash, trade.executed_at, delta.execution_price, delta.execution_quantity
+
+
 class AsyncClient:
     def __init__(
             self,
             network: Network,
             insecure: bool = False,
             credentials: grpc.ChannelCredentials = None,
+            sentry_endpoints: List[str] = None,
     ):
         # chain stubs
         self.chain_channel = (
@@ -90,6 +177,7 @@ class AsyncClient:
         self.stubCosmosTendermint = tendermint_query_grpc.ServiceStub(self.chain_channel)
         self.stubAuth = auth_query_grpc.QueryStub(self.chain_channel)
         self.stubTx = tx_service_grpc.ServiceStub(self.chain_channel)
+        self.stubChainExchange = chain_exchange_query_grpc.QueryStub(self.chain_channel)
 
         # exchange stubs
         self.exchange_channel = (
@@ -112,6 +200,43 @@ class AsyncClient:
         self.stubDerivativeExchange = derivative_exchange_rpc_grpc.InjectiveDerivativeExchangeRPCStub(self.exchange_channel)
         self.stubExplorer = explorer_rpc_grpc.InjectiveExplorerRPCStub(self.exchange_channel)
         self.stubAuction = auction_rpc_grpc.InjectiveAuctionRPCStub(self.exchange_channel)
+        self.stubExchange = exchange_rpc_grpc.InjectiveExchangeRPCStub(self.exchange_channel)
+
+        # shared upstreams for stream methods called with shared=True
+        self.stream_hub = StreamHub()
+
+        # per stream latency histograms for stream methods called with metrics=True
+        self.stream_metrics = {}
+
+        # broadcast latency per route, see fastest_broadcast_route
+        self.broadcast_latency = {"chain": LatencyStats(), "exchange": LatencyStats()}
+
+        # additional chain endpoints used by send_tx_race_mode, closed by close()
+        self.sentry_stubs_tx = {network.grpc_endpoint: self.stubTx}
+        self.sentry_channels = []
+        for endpoint in sentry_endpoints or []:
+            channel = (
+                grpc.aio.insecure_channel(endpoint, interceptors=[UnaryUnaryWithTimeout()])
+                if insecure
+                else grpc.aio.secure_channel(
+                    endpoint,
+                    credentials or grpc.ssl_channel_credentials(),
+                    interceptors=[UnaryUnaryWithTimeout()]
+                )
+            )
+            self.sentry_channels.append(channel)
+            self.sentry_stubs_tx[endpoint] = tx_service_grpc.ServiceStub(channel)
+
+    async def close(self):
+        """Close the gRPC channels opened by the client."""
+        for channel in [self.chain_channel, self.exchange_channel] + self.sentry_channels:
+            await channel.close()
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
 
     # default client methods
     async def get_latest_block(self) -> tendermint_query.GetLatestBlockResponse:
@@ -119,7 +244,7 @@ class AsyncClient:
 
     async def get_account(self, address: str) -> Optional[auth_type.BaseAccount]:
         try:
-            account_any = await self.stubAuth.Account(auth_query.QueryAccountRequest(address=address)).account
+            account_any = (await self.stubAuth.Account(auth_query.QueryAccountRequest(address=address))).account
             account = auth_type.BaseAccount()
             if account_any.Is(account.DESCRIPTOR):
                 account_any.Unpack(account)
@@ -150,10 +275,33 @@ class AsyncClient:
         except grpc.RpcError as err:
             return err, False
 
+    async def simulate_many(
+        self,
+        tx_bytes_list: List[bytes],
+        concurrency: int = 8
+    ) -> List[Tuple[Union[tx_service.SimulateResponse, grpc.RpcError], Optional[list], bool]]:
+        """
+        Simulate several transactions in parallel, at most ``concurrency`` in flight.
+
+        :return: one (simulation response or error, decoded msg responses, success) tuple per input, in order
+        """
+        async def simulate(index: int):
+            (sim_res, success) = await self.simulate_tx(tx_bytes_list[index])
+            if not success:
+                return sim_res, None, False
+            return sim_res, Composer.MsgResponses(sim_res.result.data, simulation=True), True
+
+        # keyed by position, identical tx bytes are still simulated once each
+        result = await gather_bounded(simulate, range(len(tx_bytes_list)), concurrency)
+        for err in result.errors.values():
+            raise err
+        return [result.results[index] for index in range(len(tx_bytes_list))]
+
     async def send_tx_sync_mode(self, tx_byte: bytes) -> abci_type.TxResponse:
-        result = await self.stubTx.BroadcastTx(
-            tx_service.BroadcastTxRequest(tx_bytes=tx_byte, mode=tx_service.BroadcastMode.BROADCAST_MODE_SYNC)
-        )
+        with self.broadcast_latency["chain"].measure():
+            result = await self.stubTx.BroadcastTx(
+                tx_service.BroadcastTxRequest(tx_bytes=tx_byte, mode=tx_service.BroadcastMode.BROADCAST_MODE_SYNC)
+            )
         return result.tx_response
 
     async def send_tx_async_mode(self, tx_byte: bytes) -> abci_type.TxResponse:
@@ -168,6 +316,62 @@ class AsyncClient:
         )
         return result.tx_response
 
+    async def send_tx_race_mode(self, tx_byte: bytes) -> Tuple[abci_type.TxResponse, str]:
+        """
+        Broadcast the same TxRaw in sync mode to every sentry endpoint at once.
+
+        A "tx already in mempool" rejection (sdk code 19) means another sentry gossiped it
+        first and counts as accepted. Slower broadcasts are left to complete in the background.
+
+        :return: the first accepting TxResponse and the endpoint that returned it
+        """
+        req = tx_service.BroadcastTxRequest(tx_bytes=tx_byte, mode=tx_service.BroadcastMode.BROADCAST_MODE_SYNC)
+
+        async def broadcast(stub):
+            result = await stub.BroadcastTx(req)
+            return result.tx_response
+
+        futures = {
+            asyncio.ensure_future(broadcast(stub)): endpoint
+            for endpoint, stub in self.sentry_stubs_tx.items()
+        }
+        for task in futures:
+            task.add_done_callback(_retrieve_exception)
+        pending = set(futures)
+        rejected = None
+        last_error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                endpoint = futures[task]
+                try:
+                    tx_response = task.result()
+                except grpc.RpcError as err:
+                    if _is_tx_in_mempool(err.details() or ""):
+                        tx_response = abci_type.TxResponse(
+                            txhash=hashlib.sha256(tx_byte).hexdigest().upper(),
+                            code=TX_IN_MEMPOOL_CODE,
+                            codespace="sdk",
+                            raw_log=err.details()
+                        )
+                        return tx_response, endpoint
+                    last_error = err
+                    continue
+                if tx_response.code == 0 or _is_tx_in_mempool(tx_response.raw_log, tx_response.code, tx_response.codespace):
+                    return tx_response, endpoint
+                rejected = rejected or (tx_response, endpoint)
+        if rejected is not None:
+            return rejected
+        raise last_error
+
+    def fastest_broadcast_route(self) -> Optional[str]:
+        """
+        Return "chain" or "exchange", whichever broadcast route has been faster recently.
+        Only sync mode BroadcastTx round-trips are recorded, not PrepareTx, signing or
+        waiting for block inclusion.
+        """
+        return fastest(self.broadcast_latency)
+
     async def get_chain_id(self) -> str:
         latest_block = await self.get_latest_block()
         return latest_block.block.header.chain_id
@@ -177,8 +381,158 @@ class AsyncClient:
             authz_query.QueryGrantsRequest(
                 granter=granter, grantee=grantee, msg_type_url=kwargs.get("msg_type_url")))
 
+    # Chain exchange module queries
+    # read the chain state directly instead of the exchange API indexer; sdk.Dec
+    # values are returned as integers scaled by 10^18. Markets take the same
+    # market_status as the indexer methods, orderbooks an optional depth ``limit``
+
+    async def get_subaccount_trade_nonce(self, subaccount_id: str) -> int:
+        """Return the nonce of the last order created by ``subaccount_id``, see orderhash."""
+        res = await self.stubChainExchange.SubaccountTradeNonce(
+            chain_exchange_query.QuerySubaccountTradeNonceRequest(subaccount_id=subaccount_id))
+        return res.nonce
+
+    async def get_chain_exchange_params(self):
+        req = chain_exchange_query.QueryExchangeParamsRequest()
+        return await self.stubChainExchange.QueryExchangeParams(req)
+
+    async def get_chain_subaccount_deposits(self, subaccount_id: str):
+        req = chain_exchange_query.QuerySubaccountDepositsRequest(subaccount_id=subaccount_id)
+        return await self.stubChainExchange.SubaccountDeposits(req)
+
+    async def get_chain_subaccount_deposit(self, subaccount_id: str, denom: str):
+        req = chain_exchange_query.QuerySubaccountDepositRequest(subaccount_id=subaccount_id, denom=denom)
+        return await self.stubChainExchange.SubaccountDeposit(req)
+
+    async def get_chain_spot_markets(self, **kwargs):
+        req = chain_exchange_query.QuerySpotMarketsRequest(status=_chain_market_status(kwargs.get("market_status")))
+        return await self.stubChainExchange.SpotMarkets(req)
+
+    async def get_chain_spot_market(self, market_id: str):
+        req = chain_exchange_query.QuerySpotMarketRequest(market_id=market_id)
+        return await self.stubChainExchange.SpotMarket(req)
+
+    async def get_chain_spot_orderbook(self, market_id: str, **kwargs):
+        req = chain_exchange_query.QuerySpotOrderbookRequest(market_id=market_id, limit=kwargs.get("limit"))
+        return await self.stubChainExchange.SpotOrderbook(req)
+
+    async def get_chain_trader_spot_orders(self, market_id: str, subaccount_id: str):
+        req = chain_exchange_query.QueryTraderSpotOrdersRequest(market_id=market_id, subaccount_id=subaccount_id)
+        return await self.stubChainExchange.TraderSpotOrders(req)
+
+    async def get_chain_derivative_markets(self, **kwargs):
+        req = chain_exchange_query.QueryDerivativeMarketsRequest(status=_chain_market_status(kwargs.get("market_status")))
+        return await self.stubChainExchange.DerivativeMarkets(req)
+
+    async def get_chain_derivative_market(self, market_id: str):
+        req = chain_exchange_query.QueryDerivativeMarketRequest(market_id=market_id)
+        return await self.stubChainExchange.DerivativeMarket(req)
+
+    async def get_chain_derivative_orderbook(self, market_id: str, **kwargs):
+        req = chain_exchange_query.QueryDerivativeOrderbookRequest(market_id=market_id, limit=kwargs.get("limit"))
+        return await self.stubChainExchange.DerivativeOrderbook(req)
+
+    async def get_chain_trader_derivative_orders(self, market_id: str, subaccount_id: str):
+        req = chain_exchange_query.QueryTraderDerivativeOrdersRequest(market_id=market_id, subaccount_id=subaccount_id)
+        return await self.stubChainExchange.TraderDerivativeOrders(req)
+
+    async def get_chain_positions(self):
+        req = chain_exchange_query.QueryPositionsRequest()
+        return await self.stubChainExchange.Positions(req)
+
+    async def get_chain_subaccount_positions(self, subaccount_id: str):
+        req = chain_exchange_query.QuerySubaccountPositionsRequest(subaccount_id=subaccount_id)
+        return await self.stubChainExchange.SubaccountPositions(req)
+
+    async def get_chain_subaccount_order_metadata(self, subaccount_id: str):
+        req = chain_exchange_query.QuerySubaccountOrderMetadataRequest(subaccount_id=subaccount_id)
+        return await self.stubChainExchange.SubaccountOrderMetadata(req)
+
     # Injective Exchange client methods
 
+    def _stream(self, rpc, req, snapshot=None, key=None, removal=None, is_removal=None, **kwargs):
+        """
+        Open a server stream for the stream_* methods.
+
+        resilient=True reconnects after failures and replays ``snapshot``, if the stream has one
+        (see ResilientStream); keys gone from the snapshot are emitted as ``removal`` messages,
+        shared=True attaches to one upstream per request in ``stream_hub`` with a bounded
+        queue of ``queue_size`` messages handled by the ``overflow`` policy.
+        conflate=True delivers only the latest message per ``key`` (see ConflatingStream).
+        executor=<concurrent.futures.Executor> receives raw bytes and parses them in that pool (see OffloopStream);
+        transform=<picklable callable> is applied to each parsed message in the same pool, so process
+        pool workers can return plain data instead of messages. Fields read by ``key`` must survive it.
+        metrics=True records staleness, inter-arrival and decode time histograms in ``stream_metrics``
+        under ``metrics_name`` (the grpc method path by default), reported to ``metrics_callback``
+        every ``metrics_interval`` seconds.
+        """
+        resilient = bool(kwargs.get("resilient"))
+        executor = kwargs.get("executor")
+        transform = kwargs.get("transform")
+        metrics = None
+        if kwargs.get("metrics") or kwargs.get("metrics_callback"):
+            name = kwargs.get("metrics_name") or stream_method(req)[0]
+            metrics = self.stream_metrics.get(name)
+            if metrics is None:
+                metrics = self.stream_metrics[name] = StreamMetrics(
+                    name,
+                    callback=kwargs.get("metrics_callback"),
+                    report_interval=kwargs.get("metrics_interval") or 10
+                )
+
+        def open_call():
+            if executor is not None or transform is not None or metrics is not None:
+                return open_offloop_stream(self.exchange_channel, req, executor, transform=transform, metrics=metrics)
+            return rpc(req)
+
+        def open_upstream():
+            if not resilient:
+                return open_call()
+
+            async def open_stream():
+                return open_call()
+
+            return ResilientStream(
+                open_stream=open_stream,
+                snapshot=snapshot,
+                key=key,
+                max_gap_ms=kwargs.get("max_gap_ms"),
+                idle_timeout=kwargs.get("idle_timeout"),
+                on_resync=kwargs.get("on_resync"),
+                removal=removal,
+                is_removal=is_removal
+            )
+
+        if kwargs.get("shared"):
+            stream = self.stream_hub.subscribe(
+                # subscribers only share an upstream that decodes the same way
+                StreamHub.request_key(req) + (resilient, executor, transform, metrics),
+                open_upstream,
+                maxsize=kwargs.get("queue_size"),
+                policy=kwargs.get("overflow")
+            )
+        else:
+            stream = open_upstream()
+
+        if kwargs.get("conflate"):
+            return ConflatingStream(stream, key=key)
+        return stream
+
+    async def _orderbooks_snapshot(self, get_orderbook, response_type, market_ids: List[str]):
+        responses = await asyncio.gather(*[get_orderbook(market_id=market_id) for market_id in market_ids])
+        return [
+            response_type(orderbook=res.orderbook, operation_type="update", market_id=market_id)
+            for market_id, res in zip(market_ids, responses)
+        ]
+
+    async def _orders_snapshot(self, get_orders, response_type, market_id: str, **kwargs):
+        res = await get_orders(market_id=market_id, order_side=kwargs.get("order_side"), subaccount_id=kwargs.get("subaccount_id"))
+        return [response_type(order=order, operation_type="insert") for order in res.orders]
+
+    async def _positions_snapshot(self, market_id: str, **kwargs):
+        res = await self.get_derivative_positions(market_id=market_id, subaccount_id=kwargs.get("subaccount_id"))
+        return [derivative_exchange_rpc_pb.StreamPositionsResponse(position=position) for position in res.positions]
+
     # Auction RPC
 
     async def get_auction(self, bid_round: int):
@@ -189,9 +543,9 @@ class AsyncClient:
         req = auction_rpc_pb.AuctionsRequest()
         return await self.stubAuction.Auctions(req)
 
-    async def stream_bids(self):
+    async def stream_bids(self, **kwargs):
         req = auction_rpc_pb.StreamBidsRequest()
-        return self.stubAuction.StreamBids(req)
+        return self._stream(self.stubAuction.StreamBids, req, **kwargs)
 
 
     # Meta RPC
@@ -210,9 +564,73 @@ class AsyncClient:
         )
         return await self.stubMeta.Info(req)
 
-    async def stream_keepalive(self):
+    async def stream_keepalive(self, **kwargs):
         req = exchange_meta_rpc_pb.StreamKeepaliveRequest()
-        return self.stubMeta.StreamKeepalive(req)
+        return self._stream(self.stubMeta.StreamKeepalive, req, **kwargs)
+
+    # Exchange RPC
+
+    async def get_exchange_tx(self, tx_hash: str):
+        req = exchange_rpc_pb.GetTxRequest(hash=tx_hash)
+        return await self.stubExchange.GetTx(req)
+
+    async def prepare_tx(self, chain_id: int, signer_address: str, msgs: List[message.Message], **kwargs):
+        req = exchange_rpc_pb.PrepareTxRequest(
+            chain_id=chain_id,
+            signer_address=signer_address,
+            sequence=kwargs.get("sequence"),
+            memo=kwargs.get("memo"),
+            timeout_height=kwargs.get("timeout_height"),
+            fee=kwargs.get("fee"),
+            msgs=[_msg_to_web3_json(msg) for msg in msgs]
+        )
+        return await self.stubExchange.PrepareTx(req)
+
+    async def broadcast_tx(self, chain_id: int, tx: bytes, msgs: List[message.Message], pub_key: exchange_rpc_pb.CosmosPubKey, signature: str, **kwargs):
+        req = exchange_rpc_pb.BroadcastTxRequest(
+            chain_id=chain_id,
+            tx=tx,
+            msgs=[_msg_to_web3_json(msg) for msg in msgs],
+            pub_key=pub_key,
+            signature=signature,
+            fee_payer=kwargs.get("fee_payer"),
+            fee_payer_sig=kwargs.get("fee_payer_sig"),
+            mode=kwargs.get("mode", "sync")
+        )
+        return await self.stubExchange.BroadcastTx(req)
+
+    async def send_tx_exchange_mode(self, priv_key: PrivateKey, chain_id: int, msgs: List[message.Message], **kwargs):
+        """
+        Broadcast through the exchange API instead of the chain gRPC port:
+        PrepareTx, sign the returned EIP-712 document, then BroadcastTx.
+
+        :param chain_id: the Ethereum chain id the exchange API signs for (not the cosmos chain id)
+        :param kwargs: sequence, memo, timeout_height and fee for PrepareTx, mode for BroadcastTx
+        """
+        pub_key = priv_key.to_public_key()
+        mode = kwargs.get("mode", "sync")
+        prepared = await self.prepare_tx(
+            chain_id=chain_id,
+            signer_address=pub_key.to_address().to_acc_bech32(),
+            msgs=msgs,
+            **kwargs
+        )
+        signature = priv_key.sign_typed_data(json.loads(prepared.data))
+        broadcast = self.broadcast_tx(
+            chain_id=chain_id,
+            tx=prepared.data.encode(),
+            msgs=msgs,
+            pub_key=exchange_rpc_pb.CosmosPubKey(type=ETHSECP256K1_PUBKEY_TYPE, key="0x" + pub_key.to_hex()),
+            signature="0x" + signature.hex(),
+            fee_payer=prepared.fee_payer,
+            fee_payer_sig=prepared.fee_payer_sig,
+            mode=mode
+        )
+        if mode != "sync":
+            return await broadcast
+        # only the sync BroadcastTx round-trip is comparable with send_tx_sync_mode
+        with self.broadcast_latency["exchange"].measure():
+            return await broadcast
 
     # Explorer RPC
 
@@ -220,11 +638,72 @@ class AsyncClient:
         req = explorer_rpc_pb.GetTxByTxHashRequest(hash=tx_hash)
         return await self.stubExplorer.GetTxByTxHash(req)
 
+    async def get_txs(self, **kwargs):
+        req = explorer_rpc_pb.GetTxsRequest(before=kwargs.get("before"), after=kwargs.get("after"), limit=kwargs.get("limit"), skip=kwargs.get("skip"), type=kwargs.get("type"), module=kwargs.get("module"))
+        return await self.stubExplorer.GetTxs(req)
+
+    async def get_account_txs(self, address: str, **kwargs):
+        req = explorer_rpc_pb.GetAccountTxsRequest(address=address, before=kwargs.get("before"), after=kwargs.get("after"), limit=kwargs.get("limit"), skip=kwargs.get("skip"), type=kwargs.get("type"), module=kwargs.get("module"))
+        return await self.stubExplorer.GetAccountTxs(req)
+
+    async def get_blocks(self, **kwargs):
+        req = explorer_rpc_pb.GetBlocksRequest(before=kwargs.get("before"), after=kwargs.get("after"), limit=kwargs.get("limit"))
+        return await self.stubExplorer.GetBlocks(req)
+
+    async def iter_txs(self, page_size: int = 100, prefetch: int = 2, **kwargs):
+        """Iterate GetTxs page by page, newest first, see pagination.paginate."""
+        async def fetch_page(skip: int, limit: int):
+            return (await self.get_txs(skip=skip, limit=limit, **kwargs)).data
+
+        async for tx in paginate(fetch_page, page_size, prefetch, key=lambda tx: tx.hash):
+            yield tx
+
+    async def iter_account_txs(self, address: str, page_size: int = 100, prefetch: int = 2, **kwargs):
+        """Iterate GetAccountTxs page by page, newest first, see pagination.paginate."""
+        async def fetch_page(skip: int, limit: int):
+            return (await self.get_account_txs(address, skip=skip, limit=limit, **kwargs)).data
+
+        async for tx in paginate(fetch_page, page_size, prefetch, key=lambda tx: tx.hash):
+            yield tx
+
+    async def iter_blocks(self, page_size: int = 100, prefetch: int = 2, **kwargs):
+        """
+        Iterate GetBlocks from ``before`` (or the latest block) down to ``after``, newest first.
+        Heights are contiguous, so the ``before`` cursor of every following page is known
+        once the first page arrived and those pages are prefetched like offsets.
+        """
+        first = (await self.get_blocks(limit=page_size, **kwargs)).data
+        if not first:
+            return
+        anchor = lowest = first[-1].height
+        for block in first:
+            yield block
+        if len(first) < page_size:
+            return
+        kwargs.pop("before", None)
+
+        async def fetch_page(offset: int, limit: int):
+            return (await self.get_blocks(before=anchor - offset, limit=limit, **kwargs)).data
+
+        async for block in paginate(fetch_page, page_size, prefetch):
+            # tolerate an inclusive before cursor repeating the last height
+            if block.height < lowest:
+                lowest = block.height
+                yield block
+
+    async def stream_txs(self, **kwargs):
+        req = explorer_rpc_pb.StreamTxsRequest()
+        return self._stream(self.stubExplorer.StreamTxs, req, **kwargs)
+
+    async def stream_blocks(self, **kwargs):
+        req = explorer_rpc_pb.StreamBlocksRequest()
+        return self._stream(self.stubExplorer.StreamBlocks, req, **kwargs)
+
     #AccountsRPC
 
-    async def stream_subaccount_balance(self, subaccount_id: str):
+    async def stream_subaccount_balance(self, subaccount_id: str, **kwargs):
         req = exchange_accounts_rpc_pb.StreamSubaccountBalanceRequest(subaccount_id=subaccount_id)
-        return self.stubExchangeAccount.StreamSubaccountBalance(req)
+        return self._stream(self.stubExchangeAccount.StreamSubaccountBalance, req, **kwargs)
 
     async def get_subaccount_balance(self, subaccount_id: str, denom: str):
         req = exchange_accounts_rpc_pb.SubaccountBalanceRequest(subaccount_id=subaccount_id, denom=denom)
@@ -267,9 +746,9 @@ class AsyncClient:
 
     # OracleRPC
 
-    async def stream_oracle_prices(self, base_symbol: str, quote_symbol: str, oracle_type: str):
+    async def stream_oracle_prices(self, base_symbol: str, quote_symbol: str, oracle_type: str, **kwargs):
         req = oracle_rpc_pb.StreamPricesRequest(base_symbol=base_symbol, quote_symbol=quote_symbol, oracle_type=oracle_type)
-        return self.stubOracle.StreamPrices(req)
+        return self._stream(self.stubOracle.StreamPrices, req, **kwargs)
 
     async def get_oracle_prices(self, base_symbol: str, quote_symbol: str, oracle_type: str, oracle_scale_factor: int):
         req = oracle_rpc_pb.PriceRequest(base_symbol=base_symbol, quote_symbol=quote_symbol, oracle_type=oracle_type,
@@ -301,9 +780,9 @@ class AsyncClient:
         req = spot_exchange_rpc_pb.MarketsRequest(market_status=kwargs.get("market_status"), base_denom=kwargs.get("base_denom"), quote_denom=kwargs.get("quote_denom"))
         return await self.stubSpotExchange.Markets(req)
 
-    async def stream_spot_markets(self):
+    async def stream_spot_markets(self, **kwargs):
         req = spot_exchange_rpc_pb.StreamMarketsRequest()
-        return self.stubSpotExchange.StreamMarkets(req)
+        return self._stream(self.stubSpotExchange.StreamMarkets, req, **kwargs)
 
     async def get_spot_orderbook(self, market_id: str):
         req = spot_exchange_rpc_pb.OrderbookRequest(market_id=market_id)
@@ -317,22 +796,49 @@ class AsyncClient:
         req = spot_exchange_rpc_pb.TradesRequest(market_id=market_id, execution_side=kwargs.get("execution_side"), direction=kwargs.get("direction"), subaccount_id=kwargs.get("subaccount_id"), skip=kwargs.get("skip"), limit=kwargs.get("limit"))
         return await self.stubSpotExchange.Trades(req)
 
-    async def stream_spot_orderbook(self, market_id: str):
-        req = spot_exchange_rpc_pb.StreamOrderbookRequest(market_ids=[market_id])
-        return self.stubSpotExchange.StreamOrderbook(req)
+    async def iter_spot_trades(self, market_id: str, page_size: int = 100, prefetch: int = 2, **kwargs):
+        """Iterate Trades page by page, see pagination.paginate."""
+        async def fetch_page(skip: int, limit: int):
+            return (await self.get_spot_trades(market_id, skip=skip, limit=limit, **kwargs)).trades
+
+        async for trade in paginate(fetch_page, page_size, prefetch, key=_spot_trade_key):
+            yield trade
+
+    async def _spot_market_ids(self, market_ids: List[str] = None) -> List[str]:
+        if market_ids is not None:
+            return market_ids
+        return [market.market_id for market in (await self.get_spot_markets(market_status="active")).markets]
+
+    async def get_spot_orderbooks_bulk(self, market_ids: List[str] = None, concurrency: int = 16) -> BulkResult:
+        """Fetch the orderbook of every given (default: every active) spot market concurrently."""
+        return await gather_bounded(
+            lambda market_id: self.get_spot_orderbook(market_id=market_id), await self._spot_market_ids(market_ids), concurrency)
+
+    async def get_spot_trades_bulk(self, market_ids: List[str] = None, concurrency: int = 16, **kwargs) -> BulkResult:
+        """Fetch the recent trades of every given (default: every active) spot market concurrently."""
+        return await gather_bounded(
+            lambda market_id: self.get_spot_trades(market_id, **kwargs), await self._spot_market_ids(market_ids), concurrency)
+
+    async def stream_spot_orderbook(self, market_id: str, **kwargs):
+        return await self.stream_spot_orderbooks(market_ids=[market_id], **kwargs)
 
-    async def stream_spot_orderbooks(self, market_ids: List[str]):
+    async def stream_spot_orderbooks(self, market_ids: List[str], **kwargs):
         req = spot_exchange_rpc_pb.StreamOrderbookRequest(market_ids=market_ids)
-        return self.stubSpotExchange.StreamOrderbook(req)
+        snapshot = functools.partial(self._orderbooks_snapshot, self.get_spot_orderbook, spot_exchange_rpc_pb.StreamOrderbookResponse, market_ids)
+        return self._stream(self.stubSpotExchange.StreamOrderbook, req, snapshot, key=lambda msg: msg.market_id, **kwargs)
 
 
     async def stream_spot_orders(self, market_id: str, **kwargs):
         req = spot_exchange_rpc_pb.StreamOrdersRequest(market_id=market_id, order_side=kwargs.get("order_side"), subaccount_id=kwargs.get("subaccount_id"))
-        return self.stubSpotExchange.StreamOrders(req)
+        snapshot = functools.partial(self._orders_snapshot, self.get_spot_orders, spot_exchange_rpc_pb.StreamOrdersResponse, market_id, **kwargs)
+        return self._stream(
+            self.stubSpotExchange.StreamOrders, req, snapshot, key=lambda msg: msg.order.order_hash,
+            removal=_order_removal, is_removal=_is_order_removal, **kwargs
+        )
 
     async def stream_spot_trades(self, market_id: str, **kwargs):
         req = spot_exchange_rpc_pb.StreamTradesRequest(market_id=market_id, execution_side=kwargs.get("execution_side"), direction=kwargs.get("direction"), subaccount_id=kwargs.get("subaccount_id"), skip=kwargs.get("skip"), limit=kwargs.get("limit"))
-        return self.stubSpotExchange.StreamTrades(req)
+        return self._stream(self.stubSpotExchange.StreamTrades, req, **kwargs)
 
     async def get_spot_subaccount_orders(self, subaccount_id: str, **kwargs):
         req = spot_exchange_rpc_pb.SubaccountOrdersListRequest(subaccount_id=subaccount_id, market_id=kwargs.get("market_id"))
@@ -352,9 +858,9 @@ class AsyncClient:
         req = derivative_exchange_rpc_pb.MarketsRequest(market_status=kwargs.get("market_status"), quote_denom=kwargs.get("quote_denom"))
         return await self.stubDerivativeExchange.Markets(req)
 
-    async def stream_derivative_markets(self):
+    async def stream_derivative_markets(self, **kwargs):
         req = derivative_exchange_rpc_pb.StreamMarketRequest()
-        return self.stubDerivativeExchange.StreamMarket(req)
+        return self._stream(self.stubDerivativeExchange.StreamMarket, req, **kwargs)
 
     async def get_derivative_orderbook(self, market_id: str):
         req = derivative_exchange_rpc_pb.OrderbookRequest(market_id=market_id)
@@ -368,21 +874,48 @@ class AsyncClient:
         req = derivative_exchange_rpc_pb.TradesRequest(market_id=market_id, subaccount_id=kwargs.get("subaccount_id"), execution_side=kwargs.get("execution_side"), direction=kwargs.get("direction"), skip=kwargs.get("skip"), limit=kwargs.get("limit"))
         return await self.stubDerivativeExchange.Trades(req)
 
-    async def stream_derivative_orderbook(self, market_id: str):
-        req = derivative_exchange_rpc_pb.StreamOrderbookRequest(market_ids=[market_id])
-        return self.stubDerivativeExchange.StreamOrderbook(req)
+    async def iter_derivative_trades(self, market_id: str, page_size: int = 100, prefetch: int = 2, **kwargs):
+        """Iterate Trades page by page, see pagination.paginate."""
+        async def fetch_page(skip: int, limit: int):
+            return (await self.get_derivative_trades(market_id, skip=skip, limit=limit, **kwargs)).trades
+
+        async for trade in paginate(fetch_page, page_size, prefetch, key=_derivative_trade_key):
+            yield trade
+
+    async def _derivative_market_ids(self, market_ids: List[str] = None) -> List[str]:
+        if market_ids is not None:
+            return market_ids
+        return [market.market_id for market in (await self.get_derivative_markets(market_status="active")).markets]
+
+    async def get_derivative_orderbooks_bulk(self, market_ids: List[str] = None, concurrency: int = 16) -> BulkResult:
+        """Fetch the orderbook of every given (default: every active) derivative market concurrently."""
+        return await gather_bounded(
+            lambda market_id: self.get_derivative_orderbook(market_id=market_id), await self._derivative_market_ids(market_ids), concurrency)
+
+    async def get_derivative_trades_bulk(self, market_ids: List[str] = None, concurrency: int = 16, **kwargs) -> BulkResult:
+        """Fetch the recent trades of every given (default: every active) derivative market concurrently."""
+        return await gather_bounded(
+            lambda market_id: self.get_derivative_trades(market_id, **kwargs), await self._derivative_market_ids(market_ids), concurrency)
 
-    async def stream_derivative_orderbooks(self, market_ids: List[str]):
+    async def stream_derivative_orderbook(self, market_id: str, **kwargs):
+        return await self.stream_derivative_orderbooks(market_ids=[market_id], **kwargs)
+
+    async def stream_derivative_orderbooks(self, market_ids: List[str], **kwargs):
         req = derivative_exchange_rpc_pb.StreamOrderbookRequest(market_ids=market_ids)
-        return self.stubDerivativeExchange.StreamOrderbook(req)
+        snapshot = functools.partial(self._orderbooks_snapshot, self.get_derivative_orderbook, derivative_exchange_rpc_pb.StreamOrderbookResponse, market_ids)
+        return self._stream(self.stubDerivativeExchange.StreamOrderbook, req, snapshot, key=lambda msg: msg.market_id, **kwargs)
 
     async def stream_derivative_orders(self, market_id: str, **kwargs):
         req = derivative_exchange_rpc_pb.StreamOrdersRequest(market_id=market_id, order_side=kwargs.get("order_side"), subaccount_id=kwargs.get("subaccount_id"))
-        return self.stubDerivativeExchange.StreamOrders(req)
+        snapshot = functools.partial(self._orders_snapshot, self.get_derivative_orders, derivative_exchange_rpc_pb.StreamOrdersResponse, market_id, **kwargs)
+        return self._stream(
+            self.stubDerivativeExchange.StreamOrders, req, snapshot, key=lambda msg: msg.order.order_hash,
+            removal=_order_removal, is_removal=_is_order_removal, **kwargs
+        )
 
     async def stream_derivative_trades(self, market_id: str, **kwargs):
         req = derivative_exchange_rpc_pb.StreamTradesRequest(market_id=market_id, subaccount_id=kwargs.get("subaccount_id"), execution_side=kwargs.get("execution_side"), direction=kwargs.get("direction"), skip=kwargs.get("skip"), limit=kwargs.get("limit"))
-        return self.stubDerivativeExchange.StreamTrades(req)
+        return self._stream(self.stubDerivativeExchange.StreamTrades, req, **kwargs)
 
     async def get_derivative_positions(self, market_id: str, **kwargs):
         req = derivative_exchange_rpc_pb.PositionsRequest(market_id=market_id, subaccount_id=kwargs.get("subaccount_id"))
@@ -390,7 +923,12 @@ class AsyncClient:
 
     async def stream_derivative_positions(self, market_id: str, **kwargs):
         req = derivative_exchange_rpc_pb.StreamPositionsRequest(market_id=market_id, subaccount_id=kwargs.get("subaccount_id"))
-        return self.stubDerivativeExchange.StreamPositions(req)
+        snapshot = functools.partial(self._positions_snapshot, market_id, **kwargs)
+        return self._stream(
+            self.stubDerivativeExchange.StreamPositions, req, snapshot,
+            key=lambda msg: (msg.position.market_id, msg.position.subaccount_id),
+            removal=_position_removal, is_removal=_is_position_removal, **kwargs
+        )
 
     async def get_derivative_liquidable_positions(self, **kwargs):
         req = derivative_exchange_rpc_pb.LiquidablePositionsRequest(market_id=kwargs.get("market_id"))
@@ -406,4 +944,13 @@ class AsyncClient:
 
     async def get_funding_payments(self, subaccount_id: str, **kwargs):
         req = derivative_exchange_rpc_pb.FundingPaymentsRequest(subaccount_id=subaccount_id, market_id=kwargs.get("market_id"), skip=kwargs.get("skip"), limit=kwargs.get("limit"))
-        return await self.stubDerivativeExchange.FundingPayments(req)
\ No newline at end of file
+        return await self.stubDerivativeExchange.FundingPayments(req)
+
+    async def iter_funding_payments(self, subaccount_id: str, page_size: int = 100, prefetch: int = 2, **kwargs):
+        """Iterate FundingPayments page by page, see pagination.paginate."""
+        async def fetch_page(skip: int, limit: int):
+            return (await self.get_funding_payments(subaccount_id, skip=skip, limit=limit, **kwargs)).payments
+
+        async for payment in paginate(
+                fetch_page, page_size, prefetch, key=lambda p: (p.market_id, p.subaccount_id, p.timestamp)):
+            yield payment
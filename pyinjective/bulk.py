@@ -0,0 +1,36 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, NamedTuple
+
+
+class BulkResult(NamedTuple):
+    """
+    :ivar results: response per key
+    :ivar errors: exception per key whose call failed
+    :ivar latency: seconds per key, for failed calls too
+    """
+
+    results: Dict[str, Any]
+    errors: Dict[str, BaseException]
+    latency: Dict[str, float]
+
+
+async def gather_bounded(fetch: Callable[[str], Awaitable[Any]], keys: Iterable[str], concurrency: int = 16) -> BulkResult:
+    """Call ``fetch(key)`` for every key with at most ``concurrency`` calls in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    result = BulkResult({}, {}, {})
+
+    async def run(key: str):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                result.results[key] = await fetch(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                result.errors[key] = err
+            finally:
+                result.latency[key] = time.perf_counter() - start
+
+    await asyncio.gather(*[run(key) for key in dict.fromkeys(keys)])
+    return result
@@ -1,6 +1,8 @@
 from time import time
 
-from google.protobuf import any_pb2, message, timestamp_pb2
+from typing import Dict, List, Union
+
+from google.protobuf import any_pb2, message, symbol_database, timestamp_pb2
 
 from .proto.cosmos.authz.v1beta1 import authz_pb2 as cosmos_authz_pb
 from .proto.cosmos.authz.v1beta1 import tx_pb2 as cosmos_authz_tx_pb
@@ -15,7 +17,60 @@ from .proto.injective.types.v1beta1 import tx_response_pb2 as tx_response_pb
 from .proto.injective.auction.v1beta1 import tx_pb2 as injective_auction_tx_pb
 
 from .constant import Denom
+from .exceptions import NotFoundError, OrderValidationError
 from .utils import *
+from .validation import OrderViolation, validate_derivative_order, validate_spot_order
+
+# "/<Msg full name>" -> the Msg service response class
+MSG_RESPONSE_TYPES: Dict[str, type] = {}
+
+
+def register_msg_responses(file_descriptor, module=None):
+    """
+    Register the response class of every Msg service method declared in ``file_descriptor``.
+
+    :param module: the generated _pb2 module of the file, to take the classes from
+    """
+    db = symbol_database.Default()
+    for service in file_descriptor.services_by_name.values():
+        for method in service.methods:
+            output = method.output_type
+            if module is not None and output.file.name == file_descriptor.name:
+                response_type = getattr(module, output.name)
+            else:
+                response_type = db.GetSymbol(output.full_name)
+            MSG_RESPONSE_TYPES["/" + method.input_type.full_name] = response_type
+
+
+for _tx_pb in (cosmos_authz_tx_pb, cosmos_bank_tx_pb, injective_exchange_tx_pb, injective_auction_tx_pb):
+    register_msg_responses(_tx_pb.DESCRIPTOR, _tx_pb)
+
+
+def msg_response_type(type_url: str) -> type:
+    """
+    Return the response class for a Msg type url, looking up the Msg's file in the
+    descriptor pool if it was not registered yet.
+
+    :raises NotFoundError: if no loaded proto file declares the Msg
+    """
+    response_type = MSG_RESPONSE_TYPES.get(type_url)
+    if response_type is None:
+        try:
+            descriptor = symbol_database.Default().pool.FindMessageTypeByName(type_url.lstrip("/"))
+        except KeyError:
+            raise NotFoundError("unknown msg type {}".format(type_url))
+        register_msg_responses(descriptor.file)
+        response_type = MSG_RESPONSE_TYPES.get(type_url)
+        if response_type is None:
+            raise NotFoundError("no Msg service method takes {}".format(type_url))
+    return response_type
+
+
+def decode_msg_responses(data: bytes) -> List[message.Message]:
+    """Decode the raw ``data`` of a tx result into the response of each of its msgs."""
+    response = tx_response_pb.TxResponseData.FromString(data)
+    return [msg_response_type(msg.header).FromString(msg.data) for msg in response.messages]
+
 
 class Composer:
     def __init__(self, network: str):
@@ -34,6 +89,34 @@ class Composer:
             order_hash=order_hash
         )
 
+    def ValidateSpotOrder(self, market_id: str, price: float, quantity: float, **kwargs) -> List[OrderViolation]:
+        """Check an order against the market ticks, see validation.validate_spot_order for kwargs."""
+        denom = Denom.load_market(self.network, market_id)
+        return validate_spot_order(denom, price, quantity, min_notional=kwargs.get("min_notional"))
+
+    def ValidateDerivativeOrder(
+        self,
+        market_id: str,
+        price: float,
+        quantity: float,
+        is_buy: bool,
+        **kwargs
+    ) -> List[OrderViolation]:
+        """Check an order against the market rules, see validation.validate_derivative_order for kwargs."""
+        denom = Denom.load_market(self.network, market_id)
+        return validate_derivative_order(
+            denom,
+            price,
+            quantity,
+            is_buy,
+            leverage=kwargs.get("leverage"),
+            is_reduce_only=kwargs.get("is_reduce_only"),
+            min_notional=kwargs.get("min_notional"),
+            initial_margin_ratio=kwargs.get("initial_margin_ratio"),
+            position=kwargs.get("position"),
+            available_balance=kwargs.get("available_balance"),
+        )
+
     def SpotOrder(
         self,
         market_id: str,
@@ -41,12 +124,18 @@ class Composer:
         fee_recipient: str,
         price: float,
         quantity: float,
-        is_buy: bool
+        is_buy: bool,
+        **kwargs
     ):
         # load denom metadata
         denom = Denom.load_market(self.network, market_id)
         print('Loaded market metadata for', denom.description)
 
+        if kwargs.get("validate"):
+            violations = validate_spot_order(denom, price, quantity, min_notional=kwargs.get("min_notional"))
+            if violations:
+                raise OrderValidationError(violations)
+
         # prepare values
         quantity = spot_quantity_to_backend(quantity, denom)
         price = spot_price_to_backend(price, denom)
@@ -79,6 +168,11 @@ class Composer:
         denom = Denom.load_market(self.network, market_id)
         print('Loaded market metadata for', denom.description)
 
+        if kwargs.get("validate"):
+            violations = self.ValidateDerivativeOrder(market_id, price, quantity, is_buy, **kwargs)
+            if violations:
+                raise OrderValidationError(violations)
+
         if kwargs.get("is_reduce_only") is None:
             margin = derivative_margin_to_backend(price, quantity, kwargs.get("leverage"), denom)
         elif kwargs.get("is_reduce_only", True):
@@ -433,36 +527,10 @@ class Composer:
         )
 
     # data field format: [request-msg-header][raw-byte-msg-response]
-    # you need to figure out this magic prefix number to trim request-msg-header off the data
-    # this method handles only exchange responses
+    # the header is the type url of the request msg, see MSG_RESPONSE_TYPES
     @staticmethod
-    def MsgResponses(data, simulation=False):
-        if not simulation:
+    def MsgResponses(data: Union[str, bytes], simulation=False):
+        # TxResponse.data is hex encoded, the simulation result data is raw bytes
+        if not simulation and isinstance(data, str):
             data = bytes.fromhex(data)
-        header_map = {
-            "/injective.exchange.v1beta1.MsgCreateSpotLimitOrder": injective_exchange_tx_pb.MsgCreateSpotLimitOrderResponse,
-            "/injective.exchange.v1beta1.MsgCreateSpotMarketOrder": injective_exchange_tx_pb.MsgCreateSpotMarketOrderResponse,
-            "/injective.exchange.v1beta1.MsgCreateDerivativeLimitOrder": injective_exchange_tx_pb.MsgCreateDerivativeLimitOrderResponse,
-            "/injective.exchange.v1beta1.MsgCreateDerivativeMarketOrder": injective_exchange_tx_pb.MsgCreateDerivativeMarketOrderResponse,
-            "/injective.exchange.v1beta1.MsgCancelSpotOrder": injective_exchange_tx_pb.MsgCancelSpotOrderResponse,
-            "/injective.exchange.v1beta1.MsgCancelDerivativeOrder": injective_exchange_tx_pb.MsgCancelDerivativeOrderResponse,
-            "/injective.exchange.v1beta1.MsgBatchCancelSpotOrders": injective_exchange_tx_pb.MsgBatchCancelSpotOrdersResponse,
-            "/injective.exchange.v1beta1.MsgBatchCancelDerivativeOrders": injective_exchange_tx_pb.MsgBatchCancelDerivativeOrdersResponse,
-            "/injective.exchange.v1beta1.MsgBatchCreateSpotLimitOrders": injective_exchange_tx_pb.MsgBatchCreateSpotLimitOrdersResponse,
-            "/injective.exchange.v1beta1.MsgBatchCreateDerivativeLimitOrders": injective_exchange_tx_pb.MsgBatchCreateDerivativeLimitOrdersResponse,
-            "/injective.exchange.v1beta1.MsgBatchUpdateOrders": injective_exchange_tx_pb.MsgBatchUpdateOrdersResponse,
-            "/injective.exchange.v1beta1.MsgDeposit": injective_exchange_tx_pb.MsgDepositResponse,
-            "/injective.exchange.v1beta1.MsgWithdraw": injective_exchange_tx_pb.MsgWithdrawResponse,
-            "/injective.exchange.v1beta1.MsgSubaccountTransfer": injective_exchange_tx_pb.MsgSubaccountTransferResponse,
-            "/injective.exchange.v1beta1.MsgLiquidatePosition": injective_exchange_tx_pb.MsgLiquidatePositionResponse,
-            "/injective.exchange.v1beta1.MsgIncreasePositionMargin": injective_exchange_tx_pb.MsgIncreasePositionMarginResponse,
-            "/injective.auction.v1beta1.MsgBid": injective_auction_tx_pb.MsgBidResponse,
-            "/cosmos.bank.v1beta1.MsgSend": cosmos_bank_tx_pb.MsgSendResponse
-        }
-
-        response = tx_response_pb.TxResponseData.FromString(data)
-        msgs = []
-        for msg in response.messages:
-            msgs.append(header_map[msg.header].FromString(msg.data))
-
-        return msgs
+        return decode_msg_responses(data)
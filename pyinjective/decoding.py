@@ -0,0 +1,96 @@
+"""Parsing of server stream messages in an executor, off the event loop."""
+
+import asyncio
+import functools
+import time
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Callable, Optional, Tuple
+
+from google.protobuf import descriptor_pb2, message, symbol_database
+
+from .metrics import StreamMetrics
+
+
+@functools.lru_cache(maxsize=None)
+def _stream_method(request_name: str) -> Tuple[str, Any]:
+    descriptor = symbol_database.Default().pool.FindMessageTypeByName(request_name)
+    # MethodDescriptor.server_streaming is not exposed by every protobuf runtime, the file proto has it
+    file_proto = descriptor_pb2.FileDescriptorProto()
+    descriptor.file.CopyToProto(file_proto)
+    package = file_proto.package + "." if file_proto.package else ""
+    for service in file_proto.service:
+        for method in service.method:
+            if method.input_type.lstrip(".") == request_name and method.server_streaming:
+                response_type = symbol_database.Default().GetSymbol(method.output_type.lstrip("."))
+                return "/{}{}/{}".format(package, service.name, method.name), response_type
+    raise ValueError("no server streaming method takes {}".format(request_name))
+
+
+def stream_method(request: message.Message) -> Tuple[str, Any]:
+    """Return the grpc method path and response class of the server stream taking ``request``."""
+    return _stream_method(request.DESCRIPTOR.full_name)
+
+
+def decode(response_type, data: bytes, transform: Callable[[Any], Any] = None):
+    msg = response_type.FromString(data)
+    return msg if transform is None else transform(msg)
+
+
+class OffloopStream:
+    """
+    Async iterator over a raw bytes stream call that parses each message in ``executor``,
+    or on the loop when no executor is given.
+
+    :param call: grpc stream call opened with an identity response deserializer
+    :param response_type: message class of the stream responses
+    :param executor: thread or process pool the messages are decoded in
+    :param transform: applied to every decoded message in the executor, must be picklable for process pools
+    :param metrics: StreamMetrics observing every message with its receive and decode time
+    """
+
+    def __init__(
+        self,
+        call,
+        response_type,
+        executor: Optional[Executor] = None,
+        transform: Callable[[Any], Any] = None,
+        metrics: StreamMetrics = None,
+    ):
+        self.call = call
+        self.response_type = response_type
+        self.executor = executor
+        self.transform = transform
+        self.metrics = metrics
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._iterate()
+
+    async def _iterate(self):
+        loop = asyncio.get_event_loop()
+        async for data in self.call:
+            received_at = time.time()
+            start = time.perf_counter()
+            if self.executor is None:
+                msg = decode(self.response_type, data, self.transform)
+            else:
+                msg = await loop.run_in_executor(self.executor, decode, self.response_type, data, self.transform)
+            if self.metrics is not None:
+                # includes the wait for a free worker when decoding in a pool
+                self.metrics.observe(msg, received_at, time.perf_counter() - start)
+            yield msg
+
+    def cancel(self):
+        self.call.cancel()
+
+
+def open_offloop_stream(
+    channel,
+    request: message.Message,
+    executor: Optional[Executor] = None,
+    transform: Callable[[Any], Any] = None,
+    metrics: StreamMetrics = None,
+) -> OffloopStream:
+    """Open the server stream taking ``request`` on ``channel`` with decoding done in ``executor``."""
+    path, response_type = stream_method(request)
+    rpc = channel.unary_stream(path, request_serializer=type(request).SerializeToString, response_deserializer=None)
+    return OffloopStream(rpc(request), response_type, executor, transform, metrics)
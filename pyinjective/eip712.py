@@ -0,0 +1,101 @@
+"""EIP-712 typed structured data hashing, see https://eips.ethereum.org/EIPS/eip-712."""
+
+import re
+from typing import Any, Dict, List
+
+import sha3
+
+
+ARRAY_TYPE = re.compile(r"^(.*)\[(\d*)\]$")
+
+
+def keccak(data: bytes) -> bytes:
+    k = sha3.keccak_256()
+    k.update(data)
+    return k.digest()
+
+
+def _dependencies(primary_type: str, types: Dict[str, List[dict]], found: List[str] = None) -> List[str]:
+    found = found if found is not None else []
+    if primary_type in found or primary_type not in types:
+        return found
+    found.append(primary_type)
+    for field in types[primary_type]:
+        _dependencies(ARRAY_TYPE.sub(r"\1", field["type"]), types, found)
+    return found
+
+
+def encode_type(primary_type: str, types: Dict[str, List[dict]]) -> str:
+    deps = _dependencies(primary_type, types)
+    deps = [primary_type] + sorted(dep for dep in deps if dep != primary_type)
+    return "".join(
+        "{}({})".format(dep, ",".join("{} {}".format(f["type"], f["name"]) for f in types[dep]))
+        for dep in deps
+    )
+
+
+def type_hash(primary_type: str, types: Dict[str, List[dict]]) -> bytes:
+    return keccak(encode_type(primary_type, types).encode())
+
+
+def _to_int(value: Any) -> int:
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        return int(value, 16) if value.startswith("0x") else int(value or 0)
+    return int(value)
+
+
+def _to_bytes(value: Any) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, str) and value.startswith("0x"):
+        return bytes.fromhex(value[2:])
+    raise ValueError("Expected bytes or a 0x-prefixed hex string, got {!r}".format(value))
+
+
+def _encode_value(field_type: str, value: Any, types: Dict[str, List[dict]]) -> bytes:
+    if field_type in types:
+        return hash_struct(field_type, value, types)
+
+    array = ARRAY_TYPE.match(field_type)
+    if array:
+        return keccak(b"".join(_encode_value(array.group(1), item, types) for item in value))
+
+    if field_type == "string":
+        return keccak(str(value).encode())
+    if field_type == "bytes":
+        return keccak(_to_bytes(value))
+    if field_type == "bool":
+        return int(bool(value)).to_bytes(32, "big")
+    if field_type == "address":
+        return _to_bytes(value).rjust(32, b"\x00")
+    if field_type.startswith("bytes"):
+        return _to_bytes(value).ljust(32, b"\x00")
+    if field_type.startswith("uint"):
+        return _to_int(value).to_bytes(32, "big")
+    if field_type.startswith("int"):
+        return _to_int(value).to_bytes(32, "big", signed=True)
+
+    raise ValueError("Unsupported EIP-712 type {}".format(field_type))
+
+
+def encode_data(primary_type: str, data: dict, types: Dict[str, List[dict]]) -> bytes:
+    encoded = [type_hash(primary_type, types)]
+    for field in types[primary_type]:
+        encoded.append(_encode_value(field["type"], data.get(field["name"]), types))
+    return b"".join(encoded)
+
+
+def hash_struct(primary_type: str, data: dict, types: Dict[str, List[dict]]) -> bytes:
+    return keccak(encode_data(primary_type, data, types))
+
+
+def hash_typed_data(typed_data: dict) -> bytes:
+    """Return the digest to sign for an EIP-712 ``{types, primaryType, domain, message}`` document."""
+    types = typed_data["types"]
+    return keccak(
+        b"\x19\x01"
+        + hash_struct("EIP712Domain", typed_data["domain"], types)
+        + hash_struct(typed_data["primaryType"], typed_data["message"], types)
+    )
@@ -28,3 +28,25 @@ class ConvertError(PyInjectiveError):
 
 class SchemaError(PyInjectiveError):
     pass
+
+
+class BroadcastError(PyInjectiveError):
+    pass
+
+
+class TxNotIncludedError(PyInjectiveError):
+    pass
+
+
+class SlowConsumerError(PyInjectiveError):
+    pass
+
+
+class OrderValidationError(PyInjectiveError):
+    def __init__(self, violations: list):
+        super().__init__("; ".join(violation.message for violation in violations))
+        self.violations = violations
+
+
+class IngestionError(PyInjectiveError):
+    pass
@@ -0,0 +1,147 @@
+"""Indexer lag measured against chain state."""
+
+import asyncio
+import time
+from typing import List, NamedTuple, Optional, Tuple
+
+from .orderbook import dec_to_int
+
+
+Levels = List[Tuple[int, int]]
+
+
+class BlockLag(NamedTuple):
+    chain_height: int
+    indexer_height: int
+    blocks: int
+
+
+class OrderbookLag(NamedTuple):
+    """
+    :ivar matched: whether the indexer served the chain levels before the timeout
+    :ivar seconds: time from the chain snapshot until the indexer matched it, or until the timeout
+    :ivar polls: indexer requests made
+    """
+
+    market_id: str
+    matched: bool
+    seconds: float
+    polls: int
+
+
+def chain_levels(orderbook, depth: int = None) -> Tuple[Levels, Levels]:
+    """(bids, asks) of a chain QuerySpotOrderbookResponse / QueryDerivativeOrderbookResponse, best first."""
+    bids = sorted(((int(level.price), int(level.quantity)) for level in orderbook.buys_price_level), reverse=True)
+    asks = sorted((int(level.price), int(level.quantity)) for level in orderbook.sells_price_level)
+    return bids[:depth], asks[:depth]
+
+
+def indexer_levels(orderbook, depth: int = None) -> Tuple[Levels, Levels]:
+    """(bids, asks) of an exchange API spot or derivative orderbook, best first."""
+    bids = sorted(((dec_to_int(level.price), dec_to_int(level.quantity)) for level in orderbook.buys), reverse=True)
+    asks = sorted((dec_to_int(level.price), dec_to_int(level.quantity)) for level in orderbook.sells)
+    return bids[:depth], asks[:depth]
+
+
+async def block_lag(client) -> BlockLag:
+    """Blocks the explorer indexer is behind the chain node."""
+    chain, indexer = await asyncio.gather(client.get_latest_block(), client.get_blocks(limit=1))
+    chain_height = chain.block.header.height
+    indexer_height = indexer.data[0].height if indexer.data else 0
+    return BlockLag(chain_height, indexer_height, chain_height - indexer_height)
+
+
+async def orderbook_lag(
+    client,
+    market_id: str,
+    is_derivative: bool = False,
+    depth: int = 10,
+    timeout: float = 10,
+    poll_interval: float = 0.2,
+) -> OrderbookLag:
+    """
+    Snapshot the top ``depth`` levels of a book from the chain and poll the indexer until it
+    serves the same levels.
+
+    A book that keeps changing faster than the indexer catches up may never match; such
+    samples come back with ``matched`` False after ``timeout`` seconds.
+    """
+    if is_derivative:
+        get_chain, get_indexer = client.get_chain_derivative_orderbook, client.get_derivative_orderbook
+    else:
+        get_chain, get_indexer = client.get_chain_spot_orderbook, client.get_spot_orderbook
+
+    expected = chain_levels(await get_chain(market_id, limit=depth), depth)
+    start = time.perf_counter()
+    polls = 0
+    while True:
+        res = await get_indexer(market_id)
+        polls += 1
+        elapsed = time.perf_counter() - start
+        if indexer_levels(res.orderbook, depth) == expected:
+            return OrderbookLag(market_id, True, elapsed, polls)
+        if elapsed >= timeout:
+            return OrderbookLag(market_id, False, elapsed, polls)
+        await asyncio.sleep(poll_interval)
+
+
+class IndexerLagMonitor:
+    """
+    Samples block lag and orderbook lag periodically, keeping the latest sample of each.
+
+    :param client: the AsyncClient to query both the chain and the indexer with
+    :param spot_market_ids: spot books to compare
+    :param derivative_market_ids: derivative books to compare
+    :param interval: seconds between samples
+    :param orderbook_kwargs: passed on to orderbook_lag (depth, timeout, poll_interval)
+    """
+
+    def __init__(
+        self,
+        client,
+        spot_market_ids: List[str] = None,
+        derivative_market_ids: List[str] = None,
+        interval: float = 5,
+        **orderbook_kwargs
+    ):
+        self.client = client
+        self.markets = [(market_id, False) for market_id in spot_market_ids or []]
+        self.markets += [(market_id, True) for market_id in derivative_market_ids or []]
+        self.interval = interval
+        self.orderbook_kwargs = orderbook_kwargs
+        self.blocks: Optional[BlockLag] = None
+        self.orderbooks = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def sample(self):
+        results = await asyncio.gather(
+            block_lag(self.client),
+            *[orderbook_lag(self.client, market_id, is_derivative, **self.orderbook_kwargs) for market_id, is_derivative in self.markets],
+            return_exceptions=True,
+        )
+        if not isinstance(results[0], BaseException):
+            self.blocks = results[0]
+        for lag in results[1:]:
+            if not isinstance(lag, BaseException):
+                self.orderbooks[lag.market_id] = lag
+
+    async def _run(self):
+        while True:
+            await self.sample()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def to_dict(self) -> dict:
+        return {
+            "blocks": self.blocks._asdict() if self.blocks else None,
+            "orderbooks": {market_id: lag._asdict() for market_id, lag in self.orderbooks.items()},
+        }
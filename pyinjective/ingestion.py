@@ -0,0 +1,343 @@
+"""Explorer block and transaction ingestion into an append-only SQLite store."""
+
+import asyncio
+import logging
+import sqlite3
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import grpc
+
+from .bulk import BulkResult, gather_bounded
+from .exceptions import IngestionError
+from .pagination import paginate
+from .proto.exchange import injective_explorer_rpc_pb2 as explorer_rpc_pb
+from .streams import ResilientStream
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blocks (
+    height INTEGER PRIMARY KEY,
+    block_hash TEXT,
+    parent_hash TEXT,
+    proposer TEXT,
+    moniker TEXT,
+    num_txs INTEGER,
+    timestamp TEXT,
+    raw BLOB
+);
+CREATE TABLE IF NOT EXISTS txs (
+    hash TEXT PRIMARY KEY,
+    block_number INTEGER,
+    block_timestamp TEXT,
+    code INTEGER,
+    tx_type TEXT,
+    gas_wanted INTEGER,
+    gas_used INTEGER,
+    raw BLOB
+);
+CREATE INDEX IF NOT EXISTS txs_block_number ON txs (block_number);
+CREATE TABLE IF NOT EXISTS ingested_ranges (
+    first_height INTEGER PRIMARY KEY,
+    last_height INTEGER NOT NULL
+);
+"""
+
+Range = Tuple[int, int]
+
+
+class FailedRange(NamedTuple):
+    attempts: int
+    retry_at: float
+    error: BaseException
+
+
+def _as_block(msg) -> explorer_rpc_pb.BlockInfo:
+    # StreamBlocksResponse shares the BlockInfo wire format
+    if isinstance(msg, explorer_rpc_pb.BlockInfo):
+        return msg
+    return explorer_rpc_pb.BlockInfo.FromString(msg.SerializeToString())
+
+
+def _as_tx(msg) -> explorer_rpc_pb.TxData:
+    # StreamTxsResponse shares the TxData wire format
+    if isinstance(msg, explorer_rpc_pb.TxData):
+        return msg
+    return explorer_rpc_pb.TxData.FromString(msg.SerializeToString())
+
+
+class ExplorerStore:
+    """
+    Append-only SQLite store of explorer blocks and transactions.
+
+    Every row keeps the serialized BlockInfo / TxData in ``raw`` next to the indexed
+    columns. ``ingested_ranges`` holds the merged height ranges whose blocks and
+    transactions are all stored.
+
+    :param path: database file, or ":memory:"
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _insert_blocks(self, blocks: Iterable[explorer_rpc_pb.BlockInfo]):
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO blocks VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (b.height, b.block_hash, b.parent_hash, b.proposer, b.moniker, b.num_txs, b.timestamp, b.SerializeToString())
+                for b in blocks
+            ],
+        )
+
+    def _insert_txs(self, txs: Iterable[explorer_rpc_pb.TxData]):
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO txs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (t.hash, t.block_number, t.block_timestamp, t.code, t.tx_type, t.gas_wanted, t.gas_used, t.SerializeToString())
+                for t in txs
+            ],
+        )
+
+    def _mark_ingested(self, first: int, last: int):
+        # merge with every overlapping or adjacent range
+        rows = self.conn.execute(
+            "SELECT first_height, last_height FROM ingested_ranges WHERE last_height >= ? AND first_height <= ?",
+            (first - 1, last + 1),
+        ).fetchall()
+        for row_first, row_last in rows:
+            first, last = min(first, row_first), max(last, row_last)
+        self.conn.execute(
+            "DELETE FROM ingested_ranges WHERE last_height >= ? AND first_height <= ?", (first - 1, last + 1))
+        self.conn.execute("INSERT INTO ingested_ranges VALUES (?, ?)", (first, last))
+
+    def write_range(self, first: int, last: int, blocks: List[explorer_rpc_pb.BlockInfo], txs: List[explorer_rpc_pb.TxData]):
+        """Store complete heights ``first``..``last`` and record them as ingested, atomically."""
+        with self.conn:
+            self._insert_blocks(blocks)
+            self._insert_txs(txs)
+            self._mark_ingested(first, last)
+
+    def write_txs(self, txs: List[explorer_rpc_pb.TxData]):
+        """Store transactions ahead of their block, e.g. from StreamTxs."""
+        with self.conn:
+            self._insert_txs(txs)
+
+    def ingested_ranges(self) -> List[Range]:
+        return self.conn.execute("SELECT first_height, last_height FROM ingested_ranges ORDER BY first_height").fetchall()
+
+    def missing(self, first: int, last: int) -> List[Range]:
+        """Height ranges within ``first``..``last`` not ingested yet."""
+        gaps = []
+        cursor = first
+        for row_first, row_last in self.ingested_ranges():
+            if row_last < cursor:
+                continue
+            if row_first > last:
+                break
+            if row_first > cursor:
+                gaps.append((cursor, row_first - 1))
+            cursor = row_last + 1
+        if cursor <= last:
+            gaps.append((cursor, last))
+        return gaps
+
+    def head(self, first: int) -> int:
+        """Last height of the contiguous ingested range starting at ``first``, or first - 1."""
+        row = self.conn.execute(
+            "SELECT last_height FROM ingested_ranges WHERE first_height <= ? AND last_height >= ?", (first, first)).fetchone()
+        return row[0] if row else first - 1
+
+    def count_txs(self, height: int) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM txs WHERE block_number = ?", (height,)).fetchone()[0]
+
+    def blocks(self, first: int, last: int) -> List[explorer_rpc_pb.BlockInfo]:
+        rows = self.conn.execute("SELECT raw FROM blocks WHERE height BETWEEN ? AND ? ORDER BY height", (first, last))
+        return [explorer_rpc_pb.BlockInfo.FromString(raw) for raw, in rows]
+
+    def txs(self, first: int, last: int) -> List[explorer_rpc_pb.TxData]:
+        rows = self.conn.execute(
+            "SELECT raw FROM txs WHERE block_number BETWEEN ? AND ? ORDER BY block_number", (first, last))
+        return [explorer_rpc_pb.TxData.FromString(raw) for raw, in rows]
+
+
+class ExplorerIngestor:
+    """
+    Backfills the store from ``start_height`` concurrently, then follows StreamBlocks and
+    StreamTxs. Each streamed block is stored once its transactions are complete, fetching
+    the missing ones with GetTxs; any heights skipped while disconnected are backfilled
+    before the block, so the ingested range stays contiguous.
+
+    :param client: the AsyncClient to query the explorer with
+    :param store: ExplorerStore to write to
+    :param start_height: first height to ingest
+    :param chunk_size: heights per GetBlocks request and per store transaction
+    :param concurrency: chunks fetched at the same time
+    :param page_size: transactions per GetTxs request
+    :param retry_initial: seconds before a failed chunk is fetched again, doubled per failure
+    :param retry_max: upper bound of the retry delay
+    :ivar failed: failed chunks with their attempts, next retry (monotonic time) and last error
+    """
+
+    def __init__(
+        self,
+        client,
+        store: ExplorerStore,
+        start_height: int,
+        chunk_size: int = 50,
+        concurrency: int = 4,
+        page_size: int = 100,
+        retry_initial: float = 5,
+        retry_max: float = 300,
+    ):
+        self.client = client
+        self.store = store
+        self.start_height = start_height
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.page_size = page_size
+        self.retry_initial = retry_initial
+        self.retry_max = retry_max
+        self.failed: Dict[Range, FailedRange] = {}
+        self._streams: List[ResilientStream] = []
+        self._tx_task: Optional[asyncio.Task] = None
+
+    async def _fetch_txs(self, first: int, last: int) -> List[explorer_rpc_pb.TxData]:
+        async def fetch_page(skip: int, limit: int):
+            res = await self.client.get_txs(after=first - 1, before=last + 1, skip=skip, limit=limit)
+            return res.data
+
+        txs = []
+        async for tx in paginate(fetch_page, self.page_size, key=lambda tx: tx.hash):
+            if first <= tx.block_number <= last:
+                txs.append(tx)
+        return txs
+
+    async def _ingest_chunk(self, chunk: Range):
+        first, last = chunk
+        # one spare block in case the before cursor is inclusive
+        res = await self.client.get_blocks(before=last + 1, limit=last - first + 2)
+        blocks = [block for block in res.data if first <= block.height <= last]
+        if len(blocks) != last - first + 1:
+            raise IngestionError("heights {}-{}: got {} blocks".format(first, last, len(blocks)))
+        txs = await self._fetch_txs(first, last)
+        expected = sum(block.num_txs for block in blocks)
+        if len(txs) != expected:
+            raise IngestionError("heights {}-{}: got {} of {} txs".format(first, last, len(txs), expected))
+        self.store.write_range(first, last, blocks, txs)
+
+    def _chunks(self, gaps: List[Range]) -> List[Range]:
+        return [
+            (first, min(first + self.chunk_size - 1, last))
+            for gap_first, last in gaps
+            for first in range(gap_first, last + 1, self.chunk_size)
+        ]
+
+    def _overlapping_failures(self, chunk: Range) -> List[Range]:
+        return [failed for failed in self.failed if failed[0] <= chunk[1] and chunk[0] <= failed[1]]
+
+    def _due(self, chunk: Range, now: float) -> bool:
+        return all(self.failed[failed].retry_at <= now for failed in self._overlapping_failures(chunk))
+
+    def _record_outcome(self, result: BulkResult, now: float):
+        for chunk in result.results:
+            for failed in self._overlapping_failures(chunk):
+                del self.failed[failed]
+        for chunk, err in result.errors.items():
+            logger.warning("failed to ingest heights %s-%s: %s", chunk[0], chunk[1], err)
+            attempts = 1
+            for failed in self._overlapping_failures(chunk):
+                attempts = max(attempts, self.failed.pop(failed).attempts + 1)
+            delay = min(self.retry_initial * 2 ** (attempts - 1), self.retry_max)
+            self.failed[chunk] = FailedRange(attempts, now + delay, err)
+
+    async def backfill(self, last_height: int = None) -> BulkResult:
+        """
+        Ingest every missing height from ``start_height`` to ``last_height`` (by default the
+        latest indexed block). Failed chunks are reported in the result's errors and in
+        ``failed``; they are skipped until their retry time, which backs off exponentially.
+        """
+        if last_height is None:
+            res = await self.client.get_blocks(limit=1)
+            if not res.data:
+                return BulkResult({}, {}, {})
+            last_height = res.data[0].height
+        now = time.monotonic()
+        chunks = [chunk for chunk in self._chunks(self.store.missing(self.start_height, last_height)) if self._due(chunk, now)]
+        if not chunks:
+            return BulkResult({}, {}, {})
+        result = await gather_bounded(self._ingest_chunk, chunks, self.concurrency)
+        self._record_outcome(result, time.monotonic())
+        return result
+
+    async def _catch_up(self) -> list:
+        await self.backfill()
+        return []
+
+    async def _ingest_live_block(self, block: explorer_rpc_pb.BlockInfo):
+        height = block.height
+        if height < self.start_height or not self.store.missing(height, height):
+            return
+        if self.store.missing(self.start_height, height - 1):
+            # failing heights stay missing and are retried on their own backoff schedule
+            await self.backfill(height - 1)
+        txs = []
+        if self.store.count_txs(height) < block.num_txs:
+            txs = await self._fetch_txs(height, height)
+            if len(txs) < block.num_txs:
+                raise IngestionError("height {}: got {} of {} txs".format(height, len(txs), block.num_txs))
+        self.store.write_range(height, height, [block], txs)
+        self._record_outcome(BulkResult({(height, height): None}, {}, {}), time.monotonic())
+
+    async def _follow_txs(self):
+        # transactions written here only save GetTxs calls later, so failures are logged and skipped
+        while True:
+            stream = ResilientStream(open_stream=self.client.stream_txs)
+            self._streams.append(stream)
+            try:
+                async for msg in stream:
+                    if msg.block_number >= self.start_height:
+                        self.store.write_txs([_as_tx(msg)])
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("tx stream failed, resubscribing in %ss", self.retry_initial)
+            finally:
+                stream.cancel()
+                if stream in self._streams:
+                    self._streams.remove(stream)
+            await asyncio.sleep(self.retry_initial)
+
+    async def run(self):
+        """Backfill up to the latest block, then ingest live blocks until stopped."""
+        self._tx_task = asyncio.ensure_future(self._follow_txs())
+        # the catch up runs as the stream snapshot, after subscribing and after every reconnect
+        stream = ResilientStream(open_stream=self.client.stream_blocks, snapshot=self._catch_up)
+        self._streams.append(stream)
+        try:
+            async for msg in stream:
+                block = _as_block(msg)
+                try:
+                    await self._ingest_live_block(block)
+                except (IngestionError, grpc.RpcError) as err:
+                    # left missing, backfilled by a later block or reconnect once its backoff expires
+                    chunk = (block.height, block.height)
+                    self._record_outcome(BulkResult({}, {chunk: err}, {}), time.monotonic())
+        finally:
+            await self.stop()
+
+    async def stop(self):
+        for stream in self._streams:
+            stream.cancel()
+        self._streams = []
+        if self._tx_task is not None:
+            self._tx_task.cancel()
+            await asyncio.gather(self._tx_task, return_exceptions=True)
+            self._tx_task = None
@@ -0,0 +1,214 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import AsyncIterator, Dict, List, Tuple
+
+from .metrics import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+
+class MarketEvent:
+    """
+    One message from a MarketDataHub feed.
+
+    :ivar feed: feed name, e.g. "spot_orderbook"
+    :ivar key: market id, or "BASE/QUOTE" for oracle prices
+    :ivar timestamp: server timestamp in ms
+    :ivar received_at: local receive time in ms
+    :ivar data: the stream response message
+    """
+
+    __slots__ = ("feed", "key", "timestamp", "received_at", "data")
+    kind = "event"
+
+    def __init__(self, feed: str, key: str, timestamp: int, received_at: int, data):
+        self.feed = feed
+        self.key = key
+        self.timestamp = timestamp
+        self.received_at = received_at
+        self.data = data
+
+    def __repr__(self) -> str:
+        return "{}(feed={}, key={}, timestamp={})".format(type(self).__name__, self.feed, self.key, self.timestamp)
+
+
+class OrderbookEvent(MarketEvent):
+    __slots__ = ()
+    kind = "orderbook"
+
+
+class TradeEvent(MarketEvent):
+    __slots__ = ()
+    kind = "trade"
+
+
+class OraclePriceEvent(MarketEvent):
+    __slots__ = ()
+    kind = "oracle_price"
+
+
+class FeedEndedEvent(MarketEvent):
+    """Emitted after the last event of a feed whose stream ended without an error; ``data`` is None."""
+
+    __slots__ = ()
+    kind = "feed_ended"
+
+
+class MarketDataHub:
+    """
+    Subscribes to a declared set of feeds and merges them into one async iterator of
+    events ordered by server timestamp.
+
+    Events are held for ``reorder_window_ms`` after arrival so that a message from a
+    slower stream can still be ordered before newer ones; events arriving later than
+    that are emitted as soon as possible.
+
+    :param client: AsyncClient used to open the streams
+    :param spot_orderbooks: spot market ids to follow the orderbook of
+    :param derivative_orderbooks: derivative market ids to follow the orderbook of
+    :param spot_trades: spot market ids to follow the trades of
+    :param derivative_trades: derivative market ids to follow the trades of
+    :param oracle_prices: (base_symbol, quote_symbol, oracle_type) tuples
+    :param stream_kwargs: options passed to every stream method, e.g. resilient=True
+    :ivar lag: LatencyStats of receive time minus server timestamp, per (feed, key)
+
+    A feed ending normally is reported with a FeedEndedEvent and iteration stops once every
+    feed has ended. A failing feed stops the other feeds and raises its error from the
+    iterator, after the events buffered before the failure have been emitted.
+    """
+
+    def __init__(
+        self,
+        client,
+        spot_orderbooks: List[str] = None,
+        derivative_orderbooks: List[str] = None,
+        spot_trades: List[str] = None,
+        derivative_trades: List[str] = None,
+        oracle_prices: List[Tuple[str, str, str]] = None,
+        reorder_window_ms: int = 50,
+        **stream_kwargs
+    ):
+        self.client = client
+        self.spot_orderbooks = spot_orderbooks or []
+        self.derivative_orderbooks = derivative_orderbooks or []
+        self.spot_trades = spot_trades or []
+        self.derivative_trades = derivative_trades or []
+        self.oracle_prices = oracle_prices or []
+        self.reorder_window_ms = reorder_window_ms
+        self.stream_kwargs = stream_kwargs
+
+        self.lag: Dict[Tuple[str, str], LatencyStats] = {}
+        self._heap = []
+        self._counter = itertools.count()
+        self._arrived = asyncio.Event()
+        self._streams = []
+        self._tasks = []
+        self._running = 0
+        self._error = None
+
+    async def _open_feeds(self) -> List[Tuple[str, str, type, object, callable]]:
+        client = self.client
+        kwargs = self.stream_kwargs
+        feeds = []
+        if self.spot_orderbooks:
+            stream = await client.stream_spot_orderbooks(market_ids=self.spot_orderbooks, **kwargs)
+            feeds.append(("spot_orderbook", ",".join(self.spot_orderbooks), OrderbookEvent, stream, lambda msg: msg.market_id))
+        if self.derivative_orderbooks:
+            stream = await client.stream_derivative_orderbooks(market_ids=self.derivative_orderbooks, **kwargs)
+            feeds.append(("derivative_orderbook", ",".join(self.derivative_orderbooks), OrderbookEvent, stream, lambda msg: msg.market_id))
+        for market_id in self.spot_trades:
+            stream = await client.stream_spot_trades(market_id=market_id, **kwargs)
+            feeds.append(("spot_trades", market_id, TradeEvent, stream, lambda msg: msg.trade.market_id))
+        for market_id in self.derivative_trades:
+            stream = await client.stream_derivative_trades(market_id=market_id, **kwargs)
+            feeds.append(("derivative_trades", market_id, TradeEvent, stream, lambda msg: msg.trade.market_id))
+        for base_symbol, quote_symbol, oracle_type in self.oracle_prices:
+            stream = await client.stream_oracle_prices(
+                base_symbol=base_symbol, quote_symbol=quote_symbol, oracle_type=oracle_type, **kwargs)
+            symbol = "{}/{}".format(base_symbol, quote_symbol)
+            feeds.append(("oracle_price", symbol, OraclePriceEvent, stream, lambda msg, symbol=symbol: symbol))
+        return feeds
+
+    def _push(self, event: MarketEvent):
+        heapq.heappush(self._heap, (event.timestamp, next(self._counter), time.monotonic(), event))
+        self._arrived.set()
+
+    async def _consume(self, feed: str, label: str, event_type: type, stream, key_of):
+        try:
+            async for msg in stream:
+                received_at = int(time.time() * 1000)
+                key = key_of(msg)
+                event = event_type(feed, key, msg.timestamp or received_at, received_at, msg)
+                stats = self.lag.get((feed, key))
+                if stats is None:
+                    stats = self.lag[(feed, key)] = LatencyStats()
+                if msg.timestamp:
+                    stats.record((received_at - msg.timestamp) / 1000)
+                self._push(event)
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            logger.warning("%s feed failed: %s", feed, err)
+            self._error = err
+            self._arrived.set()
+            return
+        finally:
+            self._running -= 1
+        logger.info("%s feed for %s ended", feed, label)
+        now = int(time.time() * 1000)
+        self._push(FeedEndedEvent(feed, label, now, now, None))
+
+    async def start(self):
+        if self._tasks:
+            return
+        for feed, label, event_type, stream, key_of in await self._open_feeds():
+            self._streams.append(stream)
+            self._running += 1
+            self._tasks.append(asyncio.ensure_future(self._consume(feed, label, event_type, stream, key_of)))
+
+    async def stop(self):
+        for stream in self._streams:
+            if hasattr(stream, "cancel"):
+                stream.cancel()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._streams = []
+        self._tasks = []
+
+    def __aiter__(self) -> AsyncIterator[MarketEvent]:
+        return self._iterate()
+
+    async def _iterate(self):
+        await self.start()
+        window = self.reorder_window_ms / 1000
+        while True:
+            if self._error is not None or not self._running:
+                if self._error is not None:
+                    # stop the other feeds before handing the error to the caller
+                    await self.stop()
+                # emit what was buffered before the failure or the end of the last feed
+                while self._heap:
+                    yield heapq.heappop(self._heap)[3]
+                if self._error is not None:
+                    error, self._error = self._error, None
+                    raise error
+                return
+            if self._heap:
+                wait = self._heap[0][2] + window - time.monotonic()
+                if wait <= 0:
+                    yield heapq.heappop(self._heap)[3]
+                    continue
+            else:
+                wait = None
+            self._arrived.clear()
+            try:
+                await asyncio.wait_for(self._arrived.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+
+    def lag_metrics(self) -> Dict[Tuple[str, str], dict]:
+        return {feed: stats.to_dict() for feed, stats in self.lag.items()}
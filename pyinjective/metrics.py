@@ -0,0 +1,172 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+
+class LatencyStats:
+    """
+    Running latency statistics in seconds, with an exponentially weighted mean
+    so recent samples dominate when comparing routes at runtime.
+
+    :param alpha: weight of the newest sample in the moving average
+    """
+
+    def __init__(self, alpha: float = 0.2):
+        self.alpha = alpha
+        self.count = 0
+        self.errors = 0
+        self.last: Optional[float] = None
+        self.ewma: Optional[float] = None
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, seconds: float):
+        self.count += 1
+        self.last = seconds
+        self.ewma = seconds if self.ewma is None else self.alpha * seconds + (1 - self.alpha) * self.ewma
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    @contextmanager
+    def measure(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.errors += 1
+            raise
+        self.record(time.perf_counter() - start)
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "last": self.last,
+            "ewma": self.ewma,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    def __repr__(self) -> str:
+        return "LatencyStats({})".format(self.to_dict())
+
+
+def fastest(stats: Dict[str, LatencyStats]) -> Optional[str]:
+    """Return the key with the lowest moving average, ignoring entries without samples."""
+    measured = {key: s.ewma for key, s in stats.items() if s.ewma is not None}
+    if not measured:
+        return None
+    return min(measured, key=measured.get)
+
+
+# milliseconds, roughly 1-2.5-5 per decade
+DEFAULT_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """
+    Fixed bucket histogram; ``counts[i]`` holds samples <= ``bounds[i]``, the last
+    bucket everything above the highest bound.
+    """
+
+    def __init__(self, bounds=DEFAULT_BOUNDS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the ``q`` quantile, capped by the observed max."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip([str(b) for b in self.bounds] + ["+Inf"], self.counts)),
+        }
+
+
+class StreamMetrics:
+    """
+    Per-stream histograms in milliseconds of staleness (local receive time minus the
+    message's server ``timestamp``), inter-arrival gaps and decode time.
+
+    :param name: stream name, the grpc method path when created by AsyncClient
+    :param callback: called with (name, to_dict()) at most every ``report_interval`` seconds
+    """
+
+    def __init__(self, name: str, callback: Callable[[str, dict], None] = None, report_interval: float = 10):
+        self.name = name
+        self.callback = callback
+        self.report_interval = report_interval
+        self.staleness = Histogram()
+        self.inter_arrival = Histogram()
+        self.decode = Histogram()
+        self.messages = 0
+        self._last_arrival: Optional[float] = None
+        self._last_report = time.monotonic()
+
+    def observe(self, msg, received_at: float, decode_seconds: float = None):
+        """
+        Record one message.
+
+        :param received_at: local receive time in seconds since epoch
+        :param decode_seconds: time spent parsing the message, if known
+        """
+        self.messages += 1
+        timestamp = getattr(msg, "timestamp", 0)
+        if timestamp:
+            # server timestamps are ms since epoch
+            self.staleness.record(received_at * 1000 - timestamp)
+        if self._last_arrival is not None:
+            self.inter_arrival.record((received_at - self._last_arrival) * 1000)
+        self._last_arrival = received_at
+        if decode_seconds is not None:
+            self.decode.record(decode_seconds * 1000)
+
+        if self.callback is not None and time.monotonic() - self._last_report >= self.report_interval:
+            self.report()
+
+    def report(self):
+        self._last_report = time.monotonic()
+        if self.callback is not None:
+            self.callback(self.name, self.to_dict())
+
+    def to_dict(self) -> dict:
+        return {
+            "messages": self.messages,
+            "staleness_ms": self.staleness.to_dict(),
+            "inter_arrival_ms": self.inter_arrival.to_dict(),
+            "decode_ms": self.decode.to_dict(),
+        }
+
+    def __repr__(self) -> str:
+        return "StreamMetrics({}, messages={}, staleness_p50={})".format(
+            self.name, self.messages, self.staleness.quantile(0.5))
@@ -0,0 +1,205 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+from .exceptions import NotFoundError, UndefinedError
+
+
+class AccountNonceState:
+    """
+    Sequence bookkeeping for a single account.
+
+    :ivar next_sequence: the next never-allocated sequence
+    :ivar pending: sequences handed out but not yet confirmed or released
+    :ivar gaps: sequences that were released (dropped tx) and must be reused first
+    """
+
+    def __init__(self, next_sequence: int = 0, pending: List[int] = None, gaps: List[int] = None):
+        self.next_sequence = next_sequence
+        self.pending = set(pending or [])
+        self.gaps = sorted(gaps or [])
+
+    def allocate(self) -> int:
+        if self.gaps:
+            sequence = self.gaps.pop(0)
+        else:
+            sequence = self.next_sequence
+            self.next_sequence += 1
+        self.pending.add(sequence)
+        return sequence
+
+    def confirm(self, sequence: int):
+        # the chain includes sequences in order, so everything below is consumed too
+        self.pending = {seq for seq in self.pending if seq > sequence}
+        self.gaps = [seq for seq in self.gaps if seq > sequence]
+        self.next_sequence = max(self.next_sequence, sequence + 1)
+
+    def release(self, sequence: int):
+        if sequence not in self.pending:
+            return
+        self.pending.discard(sequence)
+        self.gaps.append(sequence)
+        self.gaps.sort()
+
+    def reset(self, sequence: int):
+        # everything below the on-chain sequence has been consumed
+        self.pending = {seq for seq in self.pending if seq >= sequence}
+        if self.pending:
+            self.gaps = [seq for seq in self.gaps if seq >= sequence]
+            self.next_sequence = max(self.next_sequence, sequence)
+        else:
+            # nothing in flight, the chain value is authoritative
+            self.gaps = []
+            self.next_sequence = sequence
+
+    def to_dict(self) -> dict:
+        return {
+            "next_sequence": self.next_sequence,
+            "pending": sorted(self.pending),
+            "gaps": self.gaps,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AccountNonceState":
+        return cls(
+            next_sequence=data.get("next_sequence", 0),
+            pending=data.get("pending"),
+            gaps=data.get("gaps"),
+        )
+
+
+class MemoryNonceBackend:
+    """
+    In-process backend, safe to share between threads and coroutines.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._accounts: Dict[str, AccountNonceState] = {}
+
+    @contextmanager
+    def account(self, address: str, create: bool = False) -> Iterator[AccountNonceState]:
+        with self._lock:
+            state = self._accounts.get(address)
+            if state is None:
+                if not create:
+                    raise NotFoundError("No sequence state for account {}".format(address))
+                state = self._accounts[address] = AccountNonceState()
+            yield state
+
+
+class FileNonceBackend:
+    """
+    Backend persisting per-account state in ``directory`` and serialising access
+    with an exclusive ``flock``, so several worker processes can sign for one account.
+    """
+
+    def __init__(self, directory: str):
+        if fcntl is None:
+            raise UndefinedError("FileNonceBackend requires fcntl, which is unavailable on this platform")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        # flock is per open file description, so threads of one process still need a lock
+        self._thread_lock = threading.Lock()
+
+    def _path(self, address: str) -> str:
+        return os.path.join(self.directory, "{}.nonce".format(address))
+
+    @contextmanager
+    def account(self, address: str, create: bool = False) -> Iterator[AccountNonceState]:
+        path = self._path(address)
+        flags = os.O_RDWR | os.O_CREAT if create else os.O_RDWR
+
+        with self._thread_lock:
+            try:
+                fd = os.open(path, flags, 0o600)
+            except FileNotFoundError:
+                raise NotFoundError("No sequence state for account {}".format(address))
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                with os.fdopen(os.dup(fd), "r+") as f:
+                    raw = f.read()
+                    # checked under the lock: the file may exist but not be initialised yet
+                    if not raw and not create:
+                        raise NotFoundError("No sequence state for account {}".format(address))
+                    state = AccountNonceState.from_dict(json.loads(raw)) if raw else AccountNonceState()
+                    yield state
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(state.to_dict()))
+                    f.flush()
+                    os.fsync(f.fileno())
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+
+class NonceManager:
+    """
+    Hands out account sequences atomically.
+
+    Sequences of dropped transactions are reported back with ``release`` and are
+    reused before new ones, since the chain will not include anything past a gap.
+
+    :param backend: MemoryNonceBackend (default) or FileNonceBackend for multi-process signing
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or MemoryNonceBackend()
+
+    def init(self, address: str, sequence: int):
+        """Set or resync the account sequence from the on-chain value."""
+        with self.backend.account(address, create=True) as state:
+            state.reset(sequence)
+
+    def allocate(self, address: str) -> int:
+        with self.backend.account(address) as state:
+            return state.allocate()
+
+    def confirm(self, address: str, sequence: int):
+        """Mark ``sequence`` as included on chain."""
+        with self.backend.account(address) as state:
+            state.confirm(sequence)
+
+    def release(self, address: str, sequence: int):
+        """Return ``sequence`` of a transaction that was rejected or dropped from the mempool."""
+        with self.backend.account(address) as state:
+            state.release(sequence)
+
+    def pending(self, address: str) -> List[int]:
+        with self.backend.account(address) as state:
+            return sorted(state.pending)
+
+    def gaps(self, address: str) -> List[int]:
+        with self.backend.account(address) as state:
+            return list(state.gaps)
+
+    def state(self, address: str) -> Optional[AccountNonceState]:
+        try:
+            with self.backend.account(address) as state:
+                return AccountNonceState.from_dict(state.to_dict())
+        except NotFoundError:
+            return None
+
+    async def async_init_from_chain(self, client, address: str):
+        """Resync ``address`` with the sequence reported by an AsyncClient."""
+        account = await client.get_account(address)
+        if account is None:
+            raise NotFoundError("Account doesn't exist")
+        self.init(address, account.sequence)
+        return account
+
+    def init_from_chain(self, client, address: str):
+        """Resync ``address`` with the sequence reported by a Client."""
+        account = client.get_account(address)
+        if account is None:
+            raise NotFoundError("Account doesn't exist")
+        self.init(address, account.sequence)
+        return account
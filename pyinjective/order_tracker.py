@@ -0,0 +1,152 @@
+import asyncio
+import functools
+from typing import Dict, List, Optional, Tuple, Union
+
+from .orderbook import dec_to_int
+from .streams import ResilientStream
+
+RESTING_STATES = ("booked", "partial_filled")
+
+
+class OrderTracker:
+    """
+    Local store of the resting limit orders of one subaccount.
+
+    Each market is bootstrapped from the SubaccountOrdersList RPC and then kept up to
+    date from StreamOrders filtered by the subaccount; after a reconnect the market is
+    cleared and bootstrapped again. Orders leave the store once filled or canceled.
+
+    Orders are indexed by order hash and by (market_id, order_side, price), with
+    prices as ints scaled by 10^18 (see orderbook.dec_to_int).
+
+    :param client: the AsyncClient to query and stream with
+    :param subaccount_id: the subaccount whose orders are tracked
+    :param market_ids: markets to follow
+    :param is_derivative: follow derivative instead of spot markets
+    :param stream_kwargs: ResilientStream options, e.g. idle_timeout
+    """
+
+    def __init__(self, client, subaccount_id: str, market_ids: List[str], is_derivative: bool = False, **stream_kwargs):
+        self.client = client
+        self.subaccount_id = subaccount_id
+        self.market_ids = market_ids
+        self.is_derivative = is_derivative
+        self.stream_kwargs = stream_kwargs
+        if is_derivative:
+            self._stream_orders = client.stream_derivative_orders
+            self._get_subaccount_orders = client.get_derivative_subaccount_orders
+        else:
+            self._stream_orders = client.stream_spot_orders
+            self._get_subaccount_orders = client.get_spot_subaccount_orders
+
+        self._orders: Dict[str, object] = {}
+        self._levels: Dict[Tuple[str, str, int], Dict[str, object]] = {}
+        self._streams: List[ResilientStream] = []
+        self._tasks = []
+        self._ready: Dict[str, asyncio.Event] = {market_id: asyncio.Event() for market_id in market_ids}
+
+    async def start(self):
+        if self._tasks:
+            return
+        for market_id in self.market_ids:
+            stream = ResilientStream(
+                open_stream=functools.partial(self._stream_orders, market_id, subaccount_id=self.subaccount_id),
+                snapshot=functools.partial(self._snapshot, market_id),
+                key=lambda msg: msg.order.order_hash,
+                **self.stream_kwargs
+            )
+            self._streams.append(stream)
+            self._tasks.append(asyncio.ensure_future(self._consume(market_id, stream)))
+
+    async def stop(self):
+        for stream in self._streams:
+            stream.cancel()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._streams = []
+        self._tasks = []
+
+    async def __aenter__(self) -> "OrderTracker":
+        await self.start()
+        await self.wait_ready()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def wait_ready(self, timeout: Optional[float] = None):
+        """Wait until every market has been bootstrapped once."""
+        await asyncio.wait_for(asyncio.gather(*[event.wait() for event in self._ready.values()]), timeout)
+
+    async def _snapshot(self, market_id: str) -> list:
+        # applied here rather than replayed through the stream, so an empty
+        # subaccount still marks the market as ready
+        res = await self._get_subaccount_orders(self.subaccount_id, market_id=market_id)
+        self.clear(market_id)
+        for order in res.orders:
+            self.apply(order)
+        self._ready[market_id].set()
+        return []
+
+    async def _consume(self, market_id: str, stream: ResilientStream):
+        async for response in stream:
+            self.apply(response.order)
+
+    def apply(self, order):
+        """Insert, update or remove an order from a SpotLimitOrder / DerivativeLimitOrder."""
+        current = self._orders.get(order.order_hash)
+        if current is not None and order.updated_at and order.updated_at < current.updated_at:
+            return
+        if current is not None:
+            self._unindex(current)
+        if order.state in RESTING_STATES:
+            self._orders[order.order_hash] = order
+            self._levels.setdefault(self._level_key(order), {})[order.order_hash] = order
+        else:
+            self._orders.pop(order.order_hash, None)
+
+    def _unindex(self, order):
+        key = self._level_key(order)
+        level = self._levels.get(key)
+        if level is not None:
+            level.pop(order.order_hash, None)
+            if not level:
+                del self._levels[key]
+
+    @staticmethod
+    def _level_key(order) -> Tuple[str, str, int]:
+        return order.market_id, order.order_side, dec_to_int(order.price)
+
+    def clear(self, market_id: str = None):
+        """Forget the orders of ``market_id``, or of every market."""
+        for order in list(self._orders.values()):
+            if market_id is None or order.market_id == market_id:
+                self._unindex(order)
+                del self._orders[order.order_hash]
+
+    def get(self, order_hash: str):
+        return self._orders.get(order_hash)
+
+    def __contains__(self, order_hash: str) -> bool:
+        return order_hash in self._orders
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def orders(self, market_id: str = None, order_side: str = None) -> list:
+        return [
+            order for order in self._orders.values()
+            if (market_id is None or order.market_id == market_id)
+            and (order_side is None or order.order_side == order_side)
+        ]
+
+    def at_price(self, market_id: str, order_side: str, price: Union[str, int]) -> list:
+        """Orders resting at ``price``, given as a decimal string or a 10^18 scaled int."""
+        if isinstance(price, str):
+            price = dec_to_int(price)
+        return list(self._levels.get((market_id, order_side, price), {}).values())
+
+    def price_levels(self, market_id: str, order_side: str) -> List[int]:
+        """Scaled prices with resting orders on one side of a market, ascending."""
+        return sorted(price for market, side, price in self._levels if market == market_id and side == order_side)
@@ -0,0 +1,200 @@
+"""Local L2 order book with prices and quantities kept as ints scaled by 10^18."""
+
+from bisect import bisect_left, bisect_right
+from decimal import Decimal
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+
+DEC_SCALE = 18
+
+
+def dec_to_int(value: str, scale: int = DEC_SCALE) -> int:
+    """Convert a decimal string to an int scaled by 10^scale, truncating extra digits."""
+    if "e" in value or "E" in value:
+        return int(Decimal(value).scaleb(scale))
+    whole, _, frac = value.partition(".")
+    if not whole or whole == "-":
+        whole += "0"
+    return int(whole + frac[:scale].ljust(scale, "0"))
+
+
+def int_to_dec(value: int, scale: int = DEC_SCALE) -> Decimal:
+    return Decimal(value).scaleb(-scale)
+
+
+class OrderBookSide:
+    """
+    One side of the book. Keys are stored ascending with the best level last:
+    prices for bids, negated prices for asks.
+
+    Array-backed: best level in O(1), level lookup in O(log n) via bisect, but adding or
+    removing a level shifts the lists, O(n). Levels change near the top of the book, so the
+    shift stays short in practice.
+    """
+
+    def __init__(self, is_buy: bool):
+        self.is_buy = is_buy
+        self._keys: List[int] = []
+        self._quantities: List[int] = []
+
+    def _key(self, price: int) -> int:
+        return price if self.is_buy else -price
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def clear(self):
+        self._keys = []
+        self._quantities = []
+
+    def replace(self, levels: List[Tuple[int, int]]):
+        """Replace the side with (price, quantity) levels in any order."""
+        sign = 1 if self.is_buy else -1
+        pairs = sorted((sign * price, quantity) for price, quantity in levels if quantity > 0)
+        self._keys = [key for key, _ in pairs]
+        self._quantities = [quantity for _, quantity in pairs]
+
+    def update(self, price: int, quantity: int):
+        """Set the quantity at ``price``, removing the level when quantity is zero."""
+        key = self._key(price)
+        i = bisect_left(self._keys, key)
+        exists = i < len(self._keys) and self._keys[i] == key
+        if quantity <= 0:
+            if exists:
+                del self._keys[i]
+                del self._quantities[i]
+        elif exists:
+            self._quantities[i] = quantity
+        else:
+            self._keys.insert(i, key)
+            self._quantities.insert(i, quantity)
+
+    def quantity_at(self, price: int) -> int:
+        key = self._key(price)
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return self._quantities[i]
+        return 0
+
+    def best(self) -> Optional[Tuple[int, int]]:
+        if not self._keys:
+            return None
+        return self._key(self._keys[-1]), self._quantities[-1]
+
+    def depth(self, levels: int = None) -> List[Tuple[int, int]]:
+        """Return up to ``levels`` (price, quantity) pairs, best first."""
+        n = len(self._keys)
+        start = 0 if levels is None else max(n - levels, 0)
+        return [
+            (self._key(self._keys[i]), self._quantities[i])
+            for i in range(n - 1, start - 1, -1)
+        ]
+
+    def slice(self, worst_price: int) -> List[Tuple[int, int]]:
+        """Return all levels from the best price down to ``worst_price`` inclusive, best first."""
+        start = bisect_left(self._keys, self._key(worst_price))
+        return [
+            (self._key(self._keys[i]), self._quantities[i])
+            for i in range(len(self._keys) - 1, start - 1, -1)
+        ]
+
+    def volume(self, worst_price: int) -> int:
+        """Total quantity resting between the best price and ``worst_price`` inclusive."""
+        start = bisect_left(self._keys, self._key(worst_price))
+        return sum(self._quantities[start:])
+
+    def levels_better_than(self, price: int) -> int:
+        """Number of levels strictly better than ``price``."""
+        return len(self._keys) - bisect_right(self._keys, self._key(price))
+
+
+class OrderBook:
+    """
+    L2 book for one market, fed by Orderbook snapshots or StreamOrderbook updates
+    of either the spot or the derivative exchange API.
+    """
+
+    def __init__(self, market_id: str, scale: int = DEC_SCALE):
+        self.market_id = market_id
+        self.scale = scale
+        self.bids = OrderBookSide(is_buy=True)
+        self.asks = OrderBookSide(is_buy=False)
+        self.timestamp = 0
+        self.sequence = 0
+
+    def _levels(self, price_levels) -> List[Tuple[int, int]]:
+        scale = self.scale
+        return [(dec_to_int(level.price, scale), dec_to_int(level.quantity, scale)) for level in price_levels]
+
+    def apply_snapshot(self, orderbook, timestamp: int = 0):
+        """Replace both sides with a SpotLimitOrderbook / DerivativeLimitOrderbook."""
+        self.bids.replace(self._levels(orderbook.buys))
+        self.asks.replace(self._levels(orderbook.sells))
+        self.timestamp = timestamp
+        self.sequence += 1
+
+    def apply(self, response):
+        """Apply a StreamOrderbookResponse, which carries the full book of its market."""
+        self.apply_snapshot(response.orderbook, response.timestamp)
+
+    def update_level(self, is_buy: bool, price: int, quantity: int):
+        (self.bids if is_buy else self.asks).update(price, quantity)
+
+    def best_bid(self) -> Optional[Tuple[int, int]]:
+        return self.bids.best()
+
+    def best_ask(self) -> Optional[Tuple[int, int]]:
+        return self.asks.best()
+
+    def mid_price(self) -> Optional[int]:
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return (bid[0] + ask[0]) // 2
+
+    def spread(self) -> Optional[int]:
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return ask[0] - bid[0]
+
+    def depth(self, levels: int = None) -> Dict[str, List[Tuple[int, int]]]:
+        return {"buys": self.bids.depth(levels), "sells": self.asks.depth(levels)}
+
+    def to_price(self, value: int) -> Decimal:
+        return int_to_dec(value, self.scale)
+
+    def from_price(self, value: str) -> int:
+        return dec_to_int(value, self.scale)
+
+    def __repr__(self) -> str:
+        return "OrderBook(market_id={}, bid={}, ask={}, levels={}/{})".format(
+            self.market_id, self.bids.best(), self.asks.best(), len(self.bids), len(self.asks))
+
+
+async def stream_orderbooks(client, market_ids: List[str], is_derivative: bool = False) -> AsyncIterator[OrderBook]:
+    """
+    Bootstrap an OrderBook per market from the Orderbook RPC, then keep it updated from
+    stream_spot_orderbooks / stream_derivative_orderbooks. Yields the updated book on every message.
+    """
+    if is_derivative:
+        get_orderbook, stream_orderbooks_rpc = client.get_derivative_orderbook, client.stream_derivative_orderbooks
+    else:
+        get_orderbook, stream_orderbooks_rpc = client.get_spot_orderbook, client.stream_spot_orderbooks
+
+    # subscribe first so nothing between the snapshot and the stream is lost
+    stream = await stream_orderbooks_rpc(market_ids=market_ids)
+    books = {}
+    for market_id in market_ids:
+        book = books[market_id] = OrderBook(market_id)
+        book.apply_snapshot((await get_orderbook(market_id=market_id)).orderbook)
+        yield book
+
+    async for update in stream:
+        book = books.get(update.market_id)
+        if book is None:
+            book = books[update.market_id] = OrderBook(update.market_id)
+        if update.timestamp and update.timestamp < book.timestamp:
+            continue
+        book.apply(update)
+        yield book
@@ -0,0 +1,155 @@
+"""Client-side order hashes from the subaccount trade nonce."""
+
+import asyncio
+from typing import List
+
+from .eip712 import hash_struct, keccak
+
+
+ORDER_HASH_DOMAIN = {
+    "name": "Injective Protocol",
+    "version": "2.0.0",
+    "chainId": 888,
+    "verifyingContract": "0xCcCCccccCCCCcCCCCCCcCcCccCcCCCcCcccccccC",
+    "salt": "0x" + "00" * 32,
+}
+
+ORDER_HASH_TYPES = {
+    "EIP712Domain": [
+        {"name": "name", "type": "string"},
+        {"name": "version", "type": "string"},
+        {"name": "chainId", "type": "uint256"},
+        {"name": "verifyingContract", "type": "address"},
+        {"name": "salt", "type": "bytes32"},
+    ],
+    "OrderInfo": [
+        {"name": "SubaccountId", "type": "string"},
+        {"name": "FeeRecipient", "type": "string"},
+        {"name": "Price", "type": "string"},
+        {"name": "Quantity", "type": "string"},
+    ],
+    "SpotOrder": [
+        {"name": "MarketId", "type": "string"},
+        {"name": "OrderInfo", "type": "OrderInfo"},
+        {"name": "Salt", "type": "string"},
+        {"name": "OrderType", "type": "string"},
+        {"name": "TriggerPrice", "type": "string"},
+    ],
+    "DerivativeOrder": [
+        {"name": "MarketId", "type": "string"},
+        {"name": "OrderInfo", "type": "OrderInfo"},
+        {"name": "OrderType", "type": "string"},
+        {"name": "Margin", "type": "string"},
+        {"name": "TriggerPrice", "type": "string"},
+        {"name": "Salt", "type": "string"},
+    ],
+}
+
+DOMAIN_SEPARATOR = hash_struct("EIP712Domain", ORDER_HASH_DOMAIN, ORDER_HASH_TYPES)
+
+
+def _dec_string(value: str) -> str:
+    # sdk.Dec fields travel as integers scaled by 10^18, the chain hashes Dec.String()
+    amount = int(value or 0)
+    sign = "-" if amount < 0 else ""
+    whole, frac = divmod(abs(amount), 10 ** 18)
+    return "{}{}.{:018d}".format(sign, whole, frac)
+
+
+def compute_order_hash(order, nonce: int) -> str:
+    """
+    Return the 0x-prefixed hash the chain assigns to ``order`` created with ``nonce``.
+
+    :param order: injective.exchange.v1beta1 SpotOrder or DerivativeOrder
+    :param nonce: the subaccount trade nonce after incrementing it for this order
+    """
+    order_info = order.order_info
+    message = {
+        "MarketId": order.market_id,
+        "OrderInfo": {
+            "SubaccountId": order_info.subaccount_id,
+            "FeeRecipient": order_info.fee_recipient,
+            "Price": _dec_string(order_info.price),
+            "Quantity": _dec_string(order_info.quantity),
+        },
+        "Salt": str(nonce),
+        # the Go side converts the enum value to a string as a code point
+        "OrderType": chr(order.order_type),
+        "TriggerPrice": _dec_string(order.trigger_price) if order.trigger_price else "",
+    }
+    primary_type = order.DESCRIPTOR.name
+    if primary_type == "DerivativeOrder":
+        message["Margin"] = _dec_string(order.margin)
+    digest = keccak(b"\x19\x01" + DOMAIN_SEPARATOR + hash_struct(primary_type, message, ORDER_HASH_TYPES))
+    return "0x" + digest.hex()
+
+
+class OrderHashManager:
+    """
+    Tracks the trade nonce of a subaccount to compute order hashes at signing time.
+
+    The hashes are needed before the tx is broadcast, so ``compute_order_hashes`` reserves
+    nonces on top of the nonce last read from the exchange module. The nonce only advances
+    when ``settle`` is given the included tx; a rejected, failed or dropped tx re-reads
+    the nonce and drops every reservation, since hashes computed after it assumed nonces
+    the chain will not use.
+
+    :param client: the AsyncClient used to query the nonce
+    :param subaccount_id: the subaccount the orders are created for
+    """
+
+    def __init__(self, client, subaccount_id: str):
+        self.client = client
+        self.subaccount_id = subaccount_id
+        self.nonce = None
+        self.reserved = 0
+        self._lock = asyncio.Lock()
+
+    async def _sync(self) -> int:
+        self.nonce = await self.client.get_subaccount_trade_nonce(self.subaccount_id)
+        self.reserved = 0
+        return self.nonce
+
+    async def sync(self) -> int:
+        """Re-read the nonce from the exchange module and drop all reservations."""
+        async with self._lock:
+            return await self._sync()
+
+    async def compute_order_hashes(self, spot_orders: List = None, derivative_orders: List = None) -> List[str]:
+        """
+        Return the hashes of the orders of one msg, in creation order, and reserve their nonces.
+        A MsgBatchUpdateOrders creates its spot orders before its derivative orders.
+        """
+        async with self._lock:
+            if self.nonce is None:
+                await self._sync()
+            hashes = []
+            for order in list(spot_orders or []) + list(derivative_orders or []):
+                self.reserved += 1
+                hashes.append(compute_order_hash(order, self.nonce + self.reserved))
+            return hashes
+
+    def confirm(self, order_count: int):
+        """
+        Advance the nonce for ``order_count`` orders created by an included tx. Before the
+        first sync there is nothing to advance; the next hashes read the nonce afresh.
+        """
+        if self.nonce is None:
+            self.reserved = 0
+            return
+        self.nonce += order_count
+        self.reserved = max(self.reserved - order_count, 0)
+
+    async def settle(self, order_count: int, result):
+        """
+        Apply the outcome of the tx that creates ``order_count`` hashed orders.
+
+        :param result: the included tx, as a block mode TxResponse or the explorer TxData from
+            TxTracker, or the exception raised by the broadcast or while waiting for inclusion
+        """
+        if self.nonce is None or isinstance(result, BaseException) or result.code != 0:
+            await self.sync()
+            return
+        if not (getattr(result, "height", 0) or getattr(result, "block_number", 0)):
+            raise ValueError("settle needs the included tx, not a sync mode response")
+        self.confirm(order_count)
@@ -0,0 +1,59 @@
+"""Async iteration over paged history RPCs with page prefetch."""
+
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, List
+
+
+# pages whose keys are remembered for dedupe, the current one included
+SEEN_PAGES = 3
+
+
+async def paginate(
+    fetch_page: Callable[[int, int], Awaitable[List[Any]]],
+    page_size: int = 100,
+    prefetch: int = 2,
+    key: Callable[[Any], Any] = None,
+) -> AsyncIterator[Any]:
+    """
+    Yield the items of consecutive pages until a page comes back short.
+
+    :param fetch_page: coroutine function taking (offset, page_size) and returning the page items
+    :param page_size: items requested per call
+    :param prefetch: pages requested ahead of the one being consumed
+    :param key: identity of an item; items already yielded are skipped, which covers pages
+        shifting while new entries are added at the head of the history. A shift only
+        repeats items across a page boundary, so only the keys of the last pages are kept
+    """
+    pending = deque()
+    next_offset = 0
+    recent = deque(maxlen=SEEN_PAGES)
+
+    def schedule():
+        nonlocal next_offset
+        while len(pending) <= prefetch:
+            pending.append(asyncio.ensure_future(fetch_page(next_offset, page_size)))
+            next_offset += page_size
+
+    try:
+        schedule()
+        while pending:
+            items = await pending.popleft()
+            last_page = len(items) < page_size
+            if not last_page:
+                schedule()
+            seen = set()
+            recent.append(seen)
+            for item in items:
+                if key is not None:
+                    item_key = key(item)
+                    if any(item_key in page for page in recent):
+                        continue
+                    seen.add(item_key)
+                yield item
+            if last_page:
+                return
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,170 @@
+"""Concurrent account-wide snapshots of balances, orders and positions."""
+
+import asyncio
+import functools
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .bulk import gather_bounded
+from .streams import ResilientStream
+
+
+class Table:
+    """Column store with one list per column, rows addressed by position."""
+
+    def __init__(self, columns: Tuple[str, ...]):
+        self.columns = columns
+        self.data: Dict[str, list] = {column: [] for column in columns}
+
+    def __len__(self) -> int:
+        return len(self.data[self.columns[0]])
+
+    def __getitem__(self, column: str) -> list:
+        return self.data[column]
+
+    def append(self, *values):
+        for column, value in zip(self.columns, values):
+            self.data[column].append(value)
+
+    def remove_where(self, column: str, values: Set):
+        keep = [i for i, value in enumerate(self.data[column]) if value not in values]
+        if len(keep) == len(self):
+            return
+        for name in self.columns:
+            data = self.data[name]
+            self.data[name] = [data[i] for i in keep]
+
+    def rows(self) -> List[dict]:
+        return [dict(zip(self.columns, values)) for values in zip(*(self.data[c] for c in self.columns))]
+
+
+class PortfolioSnapshot:
+    """
+    Balances, resting orders and positions of every subaccount of an account.
+
+    ``build`` queries everything; ``refresh`` re-queries only the subaccounts marked with
+    ``mark_changed`` (or passed explicitly) plus any new subaccount. ``watch`` marks
+    subaccounts as changed from their StreamSubaccountBalance updates, which fire on
+    deposits, transfers and fills alike.
+
+    :param client: the AsyncClient to query with
+    :param account_address: injective address owning the subaccounts
+    :param concurrency: maximum requests in flight
+    """
+
+    def __init__(self, client, account_address: str, concurrency: int = 16):
+        self.client = client
+        self.account_address = account_address
+        self.concurrency = concurrency
+        self.subaccount_ids: List[str] = []
+        self.balances = Table(("subaccount_id", "denom", "total_balance", "available_balance"))
+        self.orders = Table(("subaccount_id", "kind", "market_id", "order_hash", "order_side", "price", "unfilled_quantity"))
+        self.positions = Table(("subaccount_id", "market_id", "direction", "quantity", "entry_price", "margin", "mark_price"))
+        self.errors: Dict[Tuple[str, str], BaseException] = {}
+        self._changed: Set[str] = set()
+        self._watch_tasks: Dict[str, asyncio.Task] = {}
+
+    def _queries(self, subaccount_id: str) -> List[Tuple[str, str]]:
+        return [(subaccount_id, kind) for kind in ("balances", "spot_orders", "derivative_orders", "positions")]
+
+    async def _query(self, key: Tuple[str, str]):
+        subaccount_id, kind = key
+        if kind == "balances":
+            return await self.client.get_subaccount_balances_list(subaccount_id)
+        if kind == "spot_orders":
+            return await self.client.get_spot_subaccount_orders(subaccount_id)
+        if kind == "derivative_orders":
+            return await self.client.get_derivative_subaccount_orders(subaccount_id)
+        return await self.client.get_derivative_positions("", subaccount_id=subaccount_id)
+
+    async def _load(self, subaccount_ids: Iterable[str]):
+        subaccount_ids = set(subaccount_ids)
+        keys = [key for subaccount_id in subaccount_ids for key in self._queries(subaccount_id)]
+        result = await gather_bounded(self._query, keys, self.concurrency)
+
+        for table in (self.balances, self.orders, self.positions):
+            table.remove_where("subaccount_id", subaccount_ids)
+        self.errors = {key: err for key, err in self.errors.items() if key[0] not in subaccount_ids}
+        self.errors.update(result.errors)
+
+        for (subaccount_id, kind), res in result.results.items():
+            if kind == "balances":
+                for balance in res.balances:
+                    self.balances.append(
+                        subaccount_id, balance.denom, balance.deposit.total_balance, balance.deposit.available_balance)
+            elif kind == "positions":
+                for position in res.positions:
+                    self.positions.append(
+                        subaccount_id, position.market_id, position.direction, position.quantity,
+                        position.entry_price, position.margin, position.mark_price)
+            else:
+                order_kind = kind.split("_")[0]
+                for order in res.orders:
+                    self.orders.append(
+                        subaccount_id, order_kind, order.market_id, order.order_hash, order.order_side,
+                        order.price, order.unfilled_quantity)
+
+    async def build(self) -> "PortfolioSnapshot":
+        res = await self.client.get_subaccount_list(self.account_address)
+        self.subaccount_ids = list(res.subaccounts)
+        self._changed.clear()
+        await self._load(self.subaccount_ids)
+        return self
+
+    def mark_changed(self, subaccount_id: str):
+        self._changed.add(subaccount_id)
+
+    async def refresh(self, subaccount_ids: Iterable[str] = None) -> Set[str]:
+        """Re-query changed and new subaccounts and return the ids that were reloaded."""
+        res = await self.client.get_subaccount_list(self.account_address)
+        current = list(res.subaccounts)
+        reload = set(subaccount_ids) if subaccount_ids is not None else set(self._changed)
+        reload.update(set(current) - set(self.subaccount_ids))
+        removed = set(self.subaccount_ids) - set(current)
+        self.subaccount_ids = current
+        self._changed -= reload
+
+        for table in (self.balances, self.orders, self.positions):
+            table.remove_where("subaccount_id", removed)
+        if self._watch_tasks:
+            for subaccount_id in removed:
+                task = self._watch_tasks.pop(subaccount_id, None)
+                if task is not None:
+                    task.cancel()
+            await self.watch()
+        if reload:
+            await self._load(reload)
+        return reload
+
+    async def watch(self):
+        """Mark subaccounts as changed whenever their balance stream reports an update."""
+        for subaccount_id in self.subaccount_ids:
+            if subaccount_id not in self._watch_tasks:
+                self._watch_tasks[subaccount_id] = asyncio.ensure_future(self._watch(subaccount_id))
+
+    async def _watch(self, subaccount_id: str):
+        async def missed_updates() -> list:
+            # updates may have been missed while reconnecting
+            self.mark_changed(subaccount_id)
+            return []
+
+        stream = ResilientStream(
+            open_stream=functools.partial(self.client.stream_subaccount_balance, subaccount_id),
+            snapshot=missed_updates,
+            initial_snapshot=False,
+        )
+        async for _ in stream:
+            self.mark_changed(subaccount_id)
+
+    async def stop(self):
+        tasks = list(self._watch_tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._watch_tasks.clear()
+
+    def subaccount(self, subaccount_id: str) -> dict:
+        """Rows of one subaccount from every table."""
+        return {
+            name: [row for row in table.rows() if row["subaccount_id"] == subaccount_id]
+            for name, table in (("balances", self.balances), ("orders", self.orders), ("positions", self.positions))
+        }
@@ -0,0 +1,280 @@
+"""Incremental position and PnL tracking over column-wise position rows."""
+
+import asyncio
+import functools
+from decimal import Decimal
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .orderbook import DEC_SCALE, dec_to_int, int_to_dec
+from .streams import ResilientStream
+
+
+ONE = 10 ** DEC_SCALE
+
+
+class PositionRisk(NamedTuple):
+    market_id: str
+    subaccount_id: str
+    direction: str
+    quantity: Decimal
+    entry_price: Decimal
+    margin: Decimal
+    mark_price: Decimal
+    unrealized_pnl: Decimal
+    margin_ratio: Optional[Decimal]
+    liquidation_price: Decimal
+    liquidation_distance: Optional[Decimal]
+
+
+class PositionBook:
+    """
+    Column store of derivative positions and their risk figures.
+
+    For a position of quantity q, entry price e, margin m and maintenance margin ratio r,
+    marked at price p, with s = 1 for longs and -1 for shorts:
+
+        unrealized_pnl       = s * q * (p - e)
+        margin_ratio         = (m + unrealized_pnl) / (q * p)
+        liquidation_price    = (q * e - s * m) / (q * (1 - s * r))
+        liquidation_distance = s * (p - liquidation_price) / p
+    """
+
+    def __init__(self):
+        self._rows: Dict[Tuple[str, str], int] = {}
+        self.keys: List[Tuple[str, str]] = []
+        self.signs: List[int] = []
+        self.quantities: List[int] = []
+        self.entry_prices: List[int] = []
+        self.margins: List[int] = []
+        self.maintenance_ratios: List[int] = []
+        self.marks: List[int] = []
+        self.pnls: List[int] = []
+        self.margin_ratios: List[Optional[int]] = []
+        self.liquidation_prices: List[int] = []
+        self.liquidation_distances: List[Optional[int]] = []
+        self._market_rows: Dict[str, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _columns(self) -> tuple:
+        return (
+            self.keys, self.signs, self.quantities, self.entry_prices, self.margins, self.maintenance_ratios,
+            self.marks, self.pnls, self.margin_ratios, self.liquidation_prices, self.liquidation_distances,
+        )
+
+    def upsert(self, position, maintenance_ratio: int, mark: int = None):
+        """Insert or update a DerivativePosition; a zero quantity removes it."""
+        key = (position.market_id, position.subaccount_id)
+        quantity = dec_to_int(position.quantity or "0")
+        if quantity == 0:
+            self.remove(key)
+            return
+        if mark is None:
+            mark = dec_to_int(position.mark_price or position.entry_price)
+        values = (
+            key,
+            1 if position.direction == "long" else -1,
+            quantity,
+            dec_to_int(position.entry_price),
+            dec_to_int(position.margin),
+            maintenance_ratio,
+            mark,
+            0, None, 0, None,
+        )
+        row = self._rows.get(key)
+        if row is None:
+            row = self._rows[key] = len(self.keys)
+            for column, value in zip(self._columns(), values):
+                column.append(value)
+            self._market_rows.setdefault(key[0], set()).add(row)
+        else:
+            for column, value in zip(self._columns(), values):
+                column[row] = value
+        self._recompute([row])
+
+    def remove(self, key: Tuple[str, str]):
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        market_rows = self._market_rows[key[0]]
+        market_rows.discard(row)
+        if not market_rows:
+            del self._market_rows[key[0]]
+        last = len(self.keys) - 1
+        for column in self._columns():
+            # swap with the last row so removal stays O(1)
+            column[row] = column[last]
+            column.pop()
+        if row != last:
+            moved = self.keys[row]
+            self._rows[moved] = row
+            moved_rows = self._market_rows[moved[0]]
+            moved_rows.discard(last)
+            moved_rows.add(row)
+
+    def clear(self, market_id: str = None):
+        for key in [key for key in self.keys if market_id is None or key[0] == market_id]:
+            self.remove(key)
+
+    def mark(self, market_id: str, price: int):
+        """Set the mark price of every position in ``market_id`` and recompute them."""
+        rows = self._market_rows.get(market_id)
+        if not rows:
+            return
+        marks = self.marks
+        for row in rows:
+            marks[row] = price
+        self._recompute(rows)
+
+    def _recompute(self, rows: Iterable[int]):
+        signs, quantities, entries, margins = self.signs, self.quantities, self.entry_prices, self.margins
+        ratios, marks = self.maintenance_ratios, self.marks
+        pnls, margin_ratios = self.pnls, self.margin_ratios
+        liquidation_prices, liquidation_distances = self.liquidation_prices, self.liquidation_distances
+        for row in rows:
+            s, q, e, m, p = signs[row], quantities[row], entries[row], margins[row], marks[row]
+            pnl = s * q * (p - e) // ONE
+            pnls[row] = pnl
+            notional = q * p // ONE
+            margin_ratios[row] = (m + pnl) * ONE // notional if notional else None
+            liquidation = (q * e - s * m * ONE) * ONE // (q * (ONE - s * ratios[row]))
+            liquidation = max(liquidation, 0)
+            liquidation_prices[row] = liquidation
+            liquidation_distances[row] = s * (p - liquidation) * ONE // p if p else None
+
+    def total_unrealized_pnl(self, market_id: str = None) -> Decimal:
+        if market_id is None:
+            return int_to_dec(sum(self.pnls))
+        return int_to_dec(sum(self.pnls[row] for row in self._market_rows.get(market_id, [])))
+
+    def risk(self, key: Tuple[str, str]) -> Optional[PositionRisk]:
+        row = self._rows.get(key)
+        if row is None:
+            return None
+        margin_ratio = self.margin_ratios[row]
+        distance = self.liquidation_distances[row]
+        return PositionRisk(
+            market_id=key[0],
+            subaccount_id=key[1],
+            direction="long" if self.signs[row] > 0 else "short",
+            quantity=int_to_dec(self.quantities[row]),
+            entry_price=int_to_dec(self.entry_prices[row]),
+            margin=int_to_dec(self.margins[row]),
+            mark_price=int_to_dec(self.marks[row]),
+            unrealized_pnl=int_to_dec(self.pnls[row]),
+            margin_ratio=None if margin_ratio is None else int_to_dec(margin_ratio),
+            liquidation_price=int_to_dec(self.liquidation_prices[row]),
+            liquidation_distance=None if distance is None else int_to_dec(distance),
+        )
+
+    def risks(self) -> List[PositionRisk]:
+        return [self.risk(key) for key in self.keys]
+
+
+class PositionTracker:
+    """
+    Keeps the derivative positions of a subaccount and their PnL up to date without polling.
+
+    Positions are bootstrapped from the Positions RPC and updated from StreamPositions;
+    each market is marked to market from StreamPrices of its oracle, scaled by the
+    market's oracle scale factor to chain price units.
+
+    :param client: the AsyncClient to query and stream with
+    :param subaccount_id: the subaccount whose positions are tracked
+    :param market_ids: derivative markets to follow
+    :param stream_kwargs: ResilientStream options, e.g. idle_timeout
+    """
+
+    def __init__(self, client, subaccount_id: str, market_ids: List[str], **stream_kwargs):
+        self.client = client
+        self.subaccount_id = subaccount_id
+        self.market_ids = market_ids
+        self.stream_kwargs = stream_kwargs
+        self.book = PositionBook()
+        self._markets = {}
+        self._marks: Dict[str, int] = {}
+        self._streams: List[ResilientStream] = []
+        self._tasks = []
+
+    async def start(self):
+        if self._tasks:
+            return
+        responses = await asyncio.gather(*[self.client.get_derivative_market(market_id) for market_id in self.market_ids])
+        self._markets = {res.market.market_id: res.market for res in responses}
+
+        oracles: Dict[Tuple[str, str, str, int], List[str]] = {}
+        for market in self._markets.values():
+            oracle = (market.oracle_base, market.oracle_quote, market.oracle_type, market.oracle_scale_factor)
+            oracles.setdefault(oracle, []).append(market.market_id)
+
+        for market_id in self.market_ids:
+            self._run(ResilientStream(
+                open_stream=functools.partial(self.client.stream_derivative_positions, market_id, subaccount_id=self.subaccount_id),
+                snapshot=functools.partial(self._snapshot, market_id),
+                key=lambda msg: msg.position.market_id,
+                **self.stream_kwargs
+            ), self._apply_position)
+        for (base, quote, oracle_type, scale_factor), market_ids in oracles.items():
+            self._run(ResilientStream(
+                open_stream=functools.partial(self.client.stream_oracle_prices, base, quote, oracle_type),
+                **self.stream_kwargs
+            ), functools.partial(self._apply_price, market_ids, scale_factor))
+
+    def _run(self, stream: ResilientStream, handler):
+        async def consume():
+            async for msg in stream:
+                handler(msg)
+
+        self._streams.append(stream)
+        self._tasks.append(asyncio.ensure_future(consume()))
+
+    async def stop(self):
+        for stream in self._streams:
+            stream.cancel()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._streams = []
+        self._tasks = []
+
+    async def __aenter__(self) -> "PositionTracker":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _snapshot(self, market_id: str) -> list:
+        res = await self.client.get_derivative_positions(market_id, subaccount_id=self.subaccount_id)
+        self.book.clear(market_id)
+        for position in res.positions:
+            self.apply(position)
+        return []
+
+    def _apply_position(self, response):
+        self.apply(response.position)
+
+    def _apply_price(self, market_ids: List[str], scale_factor: int, response):
+        price = dec_to_int(response.price) * 10 ** scale_factor
+        for market_id in market_ids:
+            self.mark(market_id, price)
+
+    def apply(self, position):
+        market = self._markets.get(position.market_id)
+        ratio = dec_to_int(market.maintenance_margin_ratio) if market is not None else 0
+        self.book.upsert(position, ratio, self._marks.get(position.market_id))
+
+    def mark(self, market_id: str, price: int):
+        """Mark ``market_id`` at ``price``, a chain price scaled by 10^18."""
+        self._marks[market_id] = price
+        self.book.mark(market_id, price)
+
+    def positions(self) -> List[PositionRisk]:
+        return self.book.risks()
+
+    def position(self, market_id: str, subaccount_id: str = None) -> Optional[PositionRisk]:
+        return self.book.risk((market_id, subaccount_id or self.subaccount_id))
+
+    def total_unrealized_pnl(self, market_id: str = None) -> Decimal:
+        return self.book.total_unrealized_pnl(market_id)
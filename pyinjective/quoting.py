@@ -0,0 +1,106 @@
+"""Minimal order diffs for MsgBatchUpdateOrders."""
+
+from typing import Dict, List, NamedTuple, Tuple, Union
+
+from .orderbook import dec_to_int
+from .proto.injective.exchange.v1beta1 import exchange_pb2 as injective_exchange_pb
+from .proto.injective.exchange.v1beta1 import tx_pb2 as injective_exchange_tx_pb
+
+
+BUY_ORDER_TYPES = (injective_exchange_pb.OrderType.BUY, injective_exchange_pb.OrderType.STOP_BUY, injective_exchange_pb.OrderType.TAKE_BUY)
+
+
+class OrderDiff(NamedTuple):
+    to_cancel: List[injective_exchange_tx_pb.OrderData]
+    to_create: list
+    kept: list
+
+
+def _to_tick(value: Union[str, int, None]) -> int:
+    if value is None:
+        return 0
+    return dec_to_int(value) if isinstance(value, str) else value
+
+
+def _round(value: int, tick: int) -> int:
+    if tick <= 0:
+        return value
+    return (value + tick // 2) // tick * tick
+
+
+def _desired_key(order, price_tick: int, quantity_tick: int) -> Tuple[str, str, int, int, bool]:
+    side = "buy" if order.order_type in BUY_ORDER_TYPES else "sell"
+    reduce_only = order.DESCRIPTOR.name == "DerivativeOrder" and int(order.margin or 0) == 0
+    return (
+        order.market_id,
+        side,
+        _round(int(order.order_info.price), price_tick),
+        _round(int(order.order_info.quantity), quantity_tick),
+        reduce_only,
+    )
+
+
+def _resting_key(order, price_tick: int, quantity_tick: int) -> Tuple[str, str, int, int, bool]:
+    return (
+        order.market_id,
+        order.order_side,
+        _round(dec_to_int(order.price), price_tick),
+        _round(dec_to_int(order.unfilled_quantity or order.quantity), quantity_tick),
+        getattr(order, "is_reduce_only", False),
+    )
+
+
+def diff_orders(
+    desired: list,
+    resting: list,
+    min_price_tick_size: Union[str, int] = None,
+    min_quantity_tick_size: Union[str, int] = None,
+) -> OrderDiff:
+    """
+    Match desired orders against resting ones by market, side, price, remaining quantity and
+    reduce-only flag, after rounding prices and quantities to the nearest tick.
+
+    :param desired: SpotOrder or DerivativeOrder messages the book should end up with
+    :param resting: SpotLimitOrder or DerivativeLimitOrder messages currently resting
+    :param min_price_tick_size: market price tick, as a chain decimal string or 10^18 scaled int
+    :param min_quantity_tick_size: market quantity tick, as a chain decimal string or 10^18 scaled int
+    :return: orders to cancel (as OrderData), orders to create and resting orders kept
+    """
+    price_tick = _to_tick(min_price_tick_size)
+    quantity_tick = _to_tick(min_quantity_tick_size)
+
+    unmatched: Dict[tuple, list] = {}
+    for order in resting:
+        unmatched.setdefault(_resting_key(order, price_tick, quantity_tick), []).append(order)
+
+    to_create = []
+    kept = []
+    for order in desired:
+        candidates = unmatched.get(_desired_key(order, price_tick, quantity_tick))
+        if candidates:
+            kept.append(candidates.pop())
+        else:
+            to_create.append(order)
+
+    to_cancel = [
+        injective_exchange_tx_pb.OrderData(
+            market_id=order.market_id,
+            subaccount_id=order.subaccount_id,
+            order_hash=order.order_hash,
+        )
+        for orders in unmatched.values()
+        for order in orders
+    ]
+    return OrderDiff(to_cancel=to_cancel, to_create=to_create, kept=kept)
+
+
+def batch_update_kwargs(spot: OrderDiff = None, derivative: OrderDiff = None) -> dict:
+    """Keyword arguments for Composer.MsgBatchUpdateOrders applying the given diffs."""
+    kwargs = {}
+    if spot is not None:
+        kwargs["spot_orders_to_cancel"] = spot.to_cancel
+        kwargs["spot_orders_to_create"] = spot.to_create
+    if derivative is not None:
+        kwargs["derivative_orders_to_cancel"] = derivative.to_cancel
+        kwargs["derivative_orders_to_create"] = derivative.to_create
+    return kwargs
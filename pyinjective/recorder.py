@@ -0,0 +1,191 @@
+"""
+Market data recording and replay.
+
+File layout: MAGIC | varint len | message full name | record*, where
+record = int64 little endian receive time (ns) | varint len | serialized message.
+"""
+
+import asyncio
+import glob
+import mmap
+import os
+import struct
+import time
+from typing import AsyncIterator, Iterator, List, Tuple
+
+from google.protobuf import message, symbol_database
+
+from .exceptions import DecodeError
+
+
+MAGIC = b"INJREC1\n"
+RECEIVED_AT = struct.Struct("<q")
+REPLAY_YIELD_EVERY = 100
+
+
+def _encode_varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        bits = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(bits | 0x80)
+        else:
+            out.append(bits)
+            return bytes(out)
+
+
+def _decode_varint(buf, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return result, pos
+        shift += 7
+
+
+class StreamRecorder:
+    """
+    Appends stream messages with their local receive time to rotating files.
+
+    :param directory: where the recording files are written
+    :param name: file name prefix, e.g. "spot_orderbook"
+    :param max_bytes: rotate to a new file past this size
+    """
+
+    def __init__(self, directory: str, name: str, max_bytes: int = 64 * 1024 * 1024):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.name = name
+        self.max_bytes = max_bytes
+        self.count = 0
+        self._type_name = None
+        self._file = None
+        self._index = len(recording_files(directory, name))
+
+    def _open_next(self):
+        self.close()
+        path = os.path.join(self.directory, "{}-{:06d}.pb".format(self.name, self._index))
+        self._index += 1
+        self._file = open(path, "wb")
+        type_name = self._type_name.encode()
+        self._file.write(MAGIC + _encode_varint(len(type_name)) + type_name)
+
+    def record(self, msg: message.Message, received_at: int = None):
+        """Write ``msg``; ``received_at`` defaults to now, in ns since epoch."""
+        if received_at is None:
+            received_at = time.time_ns()
+        if self._type_name is None:
+            self._type_name = msg.DESCRIPTOR.full_name
+        elif msg.DESCRIPTOR.full_name != self._type_name:
+            raise ValueError("recorder {} holds {} messages, got {}".format(
+                self.name, self._type_name, msg.DESCRIPTOR.full_name))
+        if self._file is None or self._file.tell() >= self.max_bytes:
+            self._open_next()
+
+        payload = msg.SerializeToString()
+        self._file.write(RECEIVED_AT.pack(received_at) + _encode_varint(len(payload)) + payload)
+        self.count += 1
+
+    async def record_stream(self, stream) -> AsyncIterator[message.Message]:
+        """Pass ``stream`` through unchanged while recording every message."""
+        async for msg in stream:
+            self.record(msg)
+            yield msg
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "StreamRecorder":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def recording_files(directory: str, name: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(directory, "{}-*.pb".format(glob.escape(name)))))
+
+
+def read_records(path: str, message_type=None) -> Iterator[Tuple[int, message.Message]]:
+    """
+    Yield (receive time in ns, message) from one recording file, memory-mapped.
+
+    :param message_type: message class to decode with, defaults to the type stored in the file
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm[:len(MAGIC)] != MAGIC:
+                raise DecodeError("{} is not a recording file".format(path))
+            name_len, pos = _decode_varint(mm, len(MAGIC))
+            type_name = mm[pos:pos + name_len].decode()
+            pos += name_len
+            if message_type is None:
+                message_type = symbol_database.Default().GetSymbol(type_name)
+
+            end = len(mm)
+            while pos < end:
+                # a file still being written may end anywhere inside its last record
+                if pos + RECEIVED_AT.size > end:
+                    return
+                (received_at,) = RECEIVED_AT.unpack_from(mm, pos)
+                try:
+                    size, pos = _decode_varint(mm, pos + RECEIVED_AT.size)
+                except IndexError:
+                    return
+                if pos + size > end:
+                    return
+                yield received_at, message_type.FromString(mm[pos:pos + size])
+                pos += size
+
+
+class StreamReplay:
+    """
+    Replays recordings as an async iterator of the original response types, so code written
+    against the AsyncClient stream methods runs unchanged against recorded data.
+
+    :param directory: directory holding the recording files
+    :param name: file name prefix used by the StreamRecorder
+    :param speed: 1.0 replays at wall-clock pace, 10.0 ten times faster, None as fast as possible
+    :param with_timestamps: yield (receive time in ns, message) instead of bare messages
+    """
+
+    def __init__(self, directory: str, name: str, speed: float = None, with_timestamps: bool = False, message_type=None):
+        self.paths = recording_files(directory, name)
+        self.speed = speed
+        self.with_timestamps = with_timestamps
+        self.message_type = message_type
+
+    def records(self) -> Iterator[Tuple[int, message.Message]]:
+        for path in self.paths:
+            yield from read_records(path, self.message_type)
+
+    def __aiter__(self) -> AsyncIterator:
+        return self._iterate()
+
+    async def _iterate(self):
+        first_received = None
+        started = time.monotonic()
+        for count, (received_at, msg) in enumerate(self.records(), 1):
+            if self.speed is None:
+                # reading and decoding never awaits, let other tasks run now and then
+                if count % REPLAY_YIELD_EVERY == 0:
+                    await asyncio.sleep(0)
+            else:
+                if first_received is None:
+                    first_received = received_at
+                delay = (received_at - first_received) / 1e9 / self.speed - (time.monotonic() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            yield (received_at, msg) if self.with_timestamps else msg
@@ -0,0 +1,394 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Union
+
+import grpc
+
+from .exceptions import SlowConsumerError
+
+logger = logging.getLogger(__name__)
+
+
+class ResilientStream:
+    """
+    Async iterator over a server stream that survives disconnects.
+
+    When the underlying call fails, ends, or stays silent longer than ``idle_timeout``,
+    it is reopened with exponential backoff and the ``snapshot`` coroutine is replayed
+    first, so the consumer sees a consistent state before live updates resume.
+    Messages whose server timestamp goes backwards for their key are dropped.
+
+    With ``removal`` set, the stream remembers the last message of every live key; keys
+    missing from a resync snapshot (e.g. orders filled or positions closed while
+    disconnected) are emitted as ``removal(last_message)`` before the snapshot, so
+    consumers see them go away without handling resyncs themselves.
+
+    :param open_stream: coroutine function returning a new grpc stream call
+    :param snapshot: coroutine function returning stream-shaped messages describing the current state
+    :param key: function mapping a message to the key timestamps are tracked by (e.g. market_id)
+    :param initial_snapshot: replay the snapshot before the first live message too
+    :param max_gap_ms: resync when consecutive server timestamps of a key are further apart than
+        this; either one value for every key or a {key: ms} dict so only busy keys opt in.
+        The feeds carry no sequence numbers, so silence on a quiet key also counts as a gap
+    :param removal: function turning the last message of a key into a message deleting it
+    :param is_removal: function telling whether a live message deletes its key
+    :param idle_timeout: seconds without any message before the stream is considered dead
+    :param on_resync: callback invoked before each snapshot replay, e.g. to clear local state
+    """
+
+    def __init__(
+        self,
+        open_stream: Callable[[], Awaitable[Any]],
+        snapshot: Callable[[], Awaitable[List[Any]]] = None,
+        key: Callable[[Any], Any] = None,
+        initial_snapshot: bool = True,
+        max_gap_ms: Union[int, Dict[Any, int]] = None,
+        idle_timeout: float = None,
+        backoff_initial: float = 0.5,
+        backoff_max: float = 30,
+        on_resync: Callable[[], None] = None,
+        removal: Callable[[Any], Any] = None,
+        is_removal: Callable[[Any], bool] = None,
+    ):
+        self.open_stream = open_stream
+        self.snapshot = snapshot
+        self.key = key or (lambda msg: None)
+        self.initial_snapshot = initial_snapshot
+        self.max_gap_ms = max_gap_ms
+        self.idle_timeout = idle_timeout
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.on_resync = on_resync
+        self.removal = removal
+        self.is_removal = is_removal or (lambda msg: False)
+
+        self.reconnects = 0
+        self.resyncs = 0
+        self.regressions = 0
+        self._last_timestamps: Dict[Any, int] = {}
+        self._live: Dict[Any, Any] = {}
+        self._call = None
+        self._closed = False
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._iterate()
+
+    def cancel(self):
+        self._closed = True
+        if self._call is not None:
+            self._call.cancel()
+
+    async def _replay_snapshot(self) -> List[Any]:
+        if self.snapshot is None:
+            return []
+        self.resyncs += 1
+        self._last_timestamps.clear()
+        if self.on_resync is not None:
+            self.on_resync()
+        messages = await self.snapshot()
+        if self.removal is None:
+            return messages
+        previous = self._live
+        self._live = {}
+        for msg in messages:
+            self._track(msg)
+        removals = [self.removal(msg) for key, msg in previous.items() if key not in self._live]
+        return removals + messages
+
+    def _track(self, msg):
+        if self.removal is None:
+            return
+        key = self.key(msg)
+        if self.is_removal(msg):
+            self._live.pop(key, None)
+        else:
+            self._live[key] = msg
+
+    def _max_gap_ms(self, key) -> Optional[int]:
+        if isinstance(self.max_gap_ms, dict):
+            return self.max_gap_ms.get(key)
+        return self.max_gap_ms
+
+    def _check_timestamp(self, msg) -> Optional[str]:
+        timestamp = getattr(msg, "timestamp", 0)
+        if not timestamp:
+            return None
+        key = self.key(msg)
+        last = self._last_timestamps.get(key)
+        if last is not None and timestamp < last:
+            self.regressions += 1
+            return "regression"
+        self._last_timestamps[key] = timestamp
+        max_gap_ms = self._max_gap_ms(key)
+        if last is not None and max_gap_ms is not None and timestamp - last > max_gap_ms:
+            return "gap"
+        return None
+
+    async def _next(self, iterator):
+        if self.idle_timeout is None:
+            return await iterator.__anext__()
+        return await asyncio.wait_for(iterator.__anext__(), self.idle_timeout)
+
+    async def _iterate(self):
+        backoff = self.backoff_initial
+        first = True
+        while not self._closed:
+            try:
+                # subscribe before taking the snapshot so no update falls in between
+                self._call = await self.open_stream()
+                iterator = self._call.__aiter__()
+                if not first or self.initial_snapshot:
+                    for msg in await self._replay_snapshot():
+                        yield msg
+                first = False
+
+                while True:
+                    msg = await self._next(iterator)
+                    backoff = self.backoff_initial
+                    status = self._check_timestamp(msg)
+                    if status == "regression":
+                        continue
+                    if status == "gap":
+                        logger.info("stream gap detected, resyncing")
+                        for snapshot_msg in await self._replay_snapshot():
+                            yield snapshot_msg
+                        continue
+                    self._track(msg)
+                    yield msg
+            except StopAsyncIteration:
+                logger.info("stream ended by server, reconnecting")
+            except asyncio.TimeoutError:
+                logger.warning("stream idle for %ss, reconnecting", self.idle_timeout)
+            except grpc.RpcError as err:
+                if self._closed:
+                    return
+                logger.warning("stream failed, reconnecting in %ss: %s", backoff, err)
+            finally:
+                if self._call is not None:
+                    self._call.cancel()
+
+            if self._closed:
+                return
+            self.reconnects += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.backoff_max)
+
+
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+DISCONNECT = "disconnect"
+OVERFLOW_POLICIES = (BLOCK, DROP_OLDEST, DISCONNECT)
+
+_END = object()
+
+
+class Subscription:
+    """
+    One consumer of a StreamHub upstream. Iterate it like the stream itself.
+
+    :ivar dropped: messages discarded under the drop_oldest policy
+    """
+
+    def __init__(self, hub: "StreamHub", key, maxsize: int, policy: str):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError("policy must be one of {}".format(list(OVERFLOW_POLICIES)))
+        self.hub = hub
+        self.key = key
+        self.policy = policy
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self._error: Optional[BaseException] = None
+        self._closed = False
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self):
+        if self._closed and self.queue.empty():
+            return self._finish()
+        msg = await self.queue.get()
+        if msg is _END:
+            return self._finish()
+        return msg
+
+    def _finish(self):
+        if self._error is not None:
+            raise self._error
+        raise StopAsyncIteration
+
+    async def _deliver(self, msg):
+        if self._closed:
+            return
+        if self.policy == BLOCK:
+            await self.queue.put(msg)
+        elif not self.queue.full():
+            self.queue.put_nowait(msg)
+        elif self.policy == DROP_OLDEST:
+            self.queue.get_nowait()
+            self.dropped += 1
+            self.queue.put_nowait(msg)
+        else:
+            self._end(SlowConsumerError("subscriber fell {} messages behind".format(self.queue.maxsize)), discard=True)
+            self.hub._remove(self)
+
+    def _end(self, error: BaseException = None, discard: bool = False):
+        if self._closed:
+            return
+        self._closed = True
+        self._error = error
+        if discard:
+            # also unblocks a pending put under the block policy
+            while not self.queue.empty():
+                self.queue.get_nowait()
+        # a consumer waiting on an empty queue needs the marker, otherwise
+        # __anext__ notices the closed state once the queue is drained
+        if not self.queue.full():
+            self.queue.put_nowait(_END)
+
+    def cancel(self):
+        """Stop receiving; the upstream is closed once its last subscriber leaves."""
+        self._end(discard=True)
+        self.hub._remove(self)
+
+
+class StreamHub:
+    """
+    Shares one upstream stream per (request type, request) between many consumers.
+
+    Each message is decoded once and pushed to every subscriber's bounded queue.
+    When a queue is full the subscriber's overflow policy applies: ``block`` waits
+    (and so slows every subscriber of that upstream), ``drop_oldest`` discards the oldest
+    queued message and ``disconnect`` ends the subscription with SlowConsumerError.
+
+    :param maxsize: default queue size per subscriber
+    :param policy: default overflow policy
+    """
+
+    def __init__(self, maxsize: int = 100, policy: str = DROP_OLDEST):
+        self.maxsize = maxsize
+        self.policy = policy
+        self._subscribers: Dict[Any, List[Subscription]] = {}
+        self._upstreams: Dict[Any, Any] = {}
+        self._tasks: Dict[Any, asyncio.Task] = {}
+
+    @staticmethod
+    def request_key(req) -> tuple:
+        return req.DESCRIPTOR.full_name, req.SerializeToString(deterministic=True)
+
+    def subscribe(self, key, open_upstream: Callable[[], Any], maxsize: int = None, policy: str = None) -> Subscription:
+        """
+        Attach a consumer to the upstream identified by ``key``, opening it with
+        ``open_upstream`` if this is the first subscriber.
+        """
+        sub = Subscription(self, key, maxsize or self.maxsize, policy or self.policy)
+        self._subscribers.setdefault(key, []).append(sub)
+        if key not in self._tasks:
+            self._upstreams[key] = open_upstream()
+            self._tasks[key] = asyncio.ensure_future(self._pump(key))
+        return sub
+
+    def subscriber_count(self, key) -> int:
+        return len(self._subscribers.get(key, []))
+
+    async def _pump(self, key):
+        error = None
+        try:
+            async for msg in self._upstreams[key]:
+                for sub in list(self._subscribers.get(key, [])):
+                    await sub._deliver(msg)
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            error = err
+        finally:
+            # a cancelled pump may already be replaced by one for a new subscriber
+            if self._tasks.get(key) is asyncio.current_task():
+                self._upstreams.pop(key, None)
+                self._tasks.pop(key, None)
+                for sub in self._subscribers.pop(key, []):
+                    sub._end(error)
+
+    def _remove(self, sub: Subscription):
+        subs = self._subscribers.get(sub.key)
+        if subs is None or sub not in subs:
+            return
+        subs.remove(sub)
+        if not subs:
+            del self._subscribers[sub.key]
+            upstream = self._upstreams.pop(sub.key, None)
+            if upstream is not None and hasattr(upstream, "cancel"):
+                upstream.cancel()
+            task = self._tasks.pop(sub.key, None)
+            if task is not None:
+                task.cancel()
+
+    async def close(self):
+        tasks = list(self._tasks.values())
+        for subs in list(self._subscribers.values()):
+            for sub in list(subs):
+                sub.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class ConflatingStream:
+    """
+    Drains a stream continuously and keeps only the latest message per key, so a
+    busy consumer always receives the freshest state instead of a backlog.
+
+    Keys are handed out in the order they first became pending; a key updated
+    again before it was consumed keeps its place and carries the newest message.
+
+    :param upstream: any async iterable of messages (grpc call, ResilientStream, Subscription)
+    :param key: function mapping a message to its conflation key, None keeps a single slot
+    :ivar conflated: messages overwritten before the consumer saw them
+    """
+
+    def __init__(self, upstream, key: Callable[[Any], Any] = None):
+        self.upstream = upstream
+        self.key = key or (lambda msg: None)
+        self.conflated = 0
+        self._latest = OrderedDict()
+        self._ready = asyncio.Event()
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._task = asyncio.ensure_future(self._drain())
+
+    async def _drain(self):
+        try:
+            async for msg in self.upstream:
+                key = self.key(msg)
+                if key in self._latest:
+                    self.conflated += 1
+                self._latest[key] = msg
+                self._ready.set()
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            self._error = err
+        finally:
+            self._done = True
+            self._ready.set()
+
+    def __aiter__(self) -> "ConflatingStream":
+        return self
+
+    async def __anext__(self):
+        while not self._latest:
+            if self._done:
+                if self._error is not None:
+                    raise self._error
+                raise StopAsyncIteration
+            self._ready.clear()
+            await self._ready.wait()
+        _, msg = self._latest.popitem(last=False)
+        return msg
+
+    def latest(self) -> Dict[Any, Any]:
+        """Pending messages by key, without consuming them."""
+        return dict(self._latest)
+
+    def cancel(self):
+        self._task.cancel()
+        if hasattr(self.upstream, "cancel"):
+            self.upstream.cancel()
@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+import grpc
+
+from .exceptions import BroadcastError, TxNotIncludedError
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_tx_hash(tx_hash: str) -> str:
+    # chain returns upper case hex, the explorer 0x-prefixed lower case
+    tx_hash = tx_hash.lower()
+    return tx_hash[2:] if tx_hash.startswith("0x") else tx_hash
+
+
+class TxTracker:
+    """
+    Confirms transactions off a single explorer stream instead of holding a
+    block mode broadcast open per transaction.
+
+    Transactions are broadcast in sync mode and their hash is registered; every
+    StreamTxs (or StreamBlocks) message resolves the matching futures. Hashes still
+    pending after ``fallback_after`` seconds are looked up with GetTxByTxHash, which
+    also covers anything missed while the stream was reconnecting. Hashes still not
+    included after ``max_age`` seconds, e.g. dropped from the mempool, fail with
+    TxNotIncludedError and are no longer tracked.
+
+    :param client: the AsyncClient used to broadcast and to watch the explorer
+    :param source: "txs" to follow StreamTxs, "blocks" to follow StreamBlocks
+    :param fallback_after: seconds before a pending hash is queried directly
+    :param reconnect_delay: seconds to wait before reopening a failed stream
+    :param max_fallback_queries: cap on GetTxByTxHash lookups per sweep
+    :param max_age: seconds a hash is tracked before its future fails
+    """
+
+    def __init__(
+        self,
+        client,
+        source: str = "txs",
+        fallback_after: float = 5,
+        reconnect_delay: float = 1,
+        max_fallback_queries: int = 20,
+        max_age: float = 120,
+    ):
+        if source not in ("txs", "blocks"):
+            raise ValueError("source must be one of ['txs', 'blocks']")
+        self.client = client
+        self.source = source
+        self.fallback_after = fallback_after
+        self.reconnect_delay = reconnect_delay
+        self.max_fallback_queries = max_fallback_queries
+        self.max_age = max_age
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._registered_at: Dict[str, float] = {}
+        self._tracked_at: Dict[str, float] = {}
+        self._tasks = []
+
+    async def start(self):
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.ensure_future(self._watch_stream()),
+            asyncio.ensure_future(self._poll_fallback()),
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for fut in self._pending.values():
+            if not fut.done():
+                fut.cancel()
+        self._pending.clear()
+        self._registered_at.clear()
+        self._tracked_at.clear()
+
+    async def __aenter__(self) -> "TxTracker":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    def track(self, tx_hash: str) -> asyncio.Future:
+        """Return a future resolved with the explorer TxData once ``tx_hash`` is included."""
+        key = normalize_tx_hash(tx_hash)
+        fut = self._pending.get(key)
+        if fut is None:
+            fut = asyncio.get_event_loop().create_future()
+            self._pending[key] = fut
+            self._registered_at[key] = self._tracked_at[key] = time.monotonic()
+        return fut
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    async def broadcast(self, tx_byte: bytes) -> asyncio.Future:
+        """
+        Broadcast in sync mode and return the inclusion future.
+
+        :raises BroadcastError: if the transaction is rejected by CheckTx
+        """
+        tx_response = await self.client.send_tx_sync_mode(tx_byte)
+        if tx_response.code != 0:
+            raise BroadcastError("tx {} rejected with code {}: {}".format(
+                tx_response.txhash, tx_response.code, tx_response.raw_log))
+        return self.track(tx_response.txhash)
+
+    async def wait(self, tx_hash: str, timeout: Optional[float] = None):
+        fut = self.track(tx_hash)
+        return await asyncio.wait_for(asyncio.shield(fut), timeout)
+
+    def _resolve(self, tx_hash: str, tx):
+        key = normalize_tx_hash(tx_hash)
+        fut = self._pending.pop(key, None)
+        self._registered_at.pop(key, None)
+        self._tracked_at.pop(key, None)
+        if fut is not None and not fut.done():
+            fut.set_result(tx)
+
+    def _expire(self, now: float):
+        for key in [key for key, at in self._tracked_at.items() if at <= now - self.max_age]:
+            fut = self._pending.pop(key)
+            del self._registered_at[key]
+            del self._tracked_at[key]
+            if not fut.done():
+                fut.set_exception(TxNotIncludedError("tx {} not included after {}s".format(key, self.max_age)))
+
+    async def _watch_stream(self):
+        while True:
+            try:
+                if self.source == "txs":
+                    stream = await self.client.stream_txs()
+                    async for tx in stream:
+                        self._resolve(tx.hash, tx)
+                else:
+                    stream = await self.client.stream_blocks()
+                    async for block in stream:
+                        for tx in block.txs:
+                            self._resolve(tx.hash, tx)
+            except asyncio.CancelledError:
+                raise
+            except grpc.RpcError as err:
+                logger.warning("explorer %s stream failed, reconnecting: %s", self.source, err)
+            except Exception:
+                logger.exception("explorer %s stream failed, reconnecting", self.source)
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _poll_fallback(self):
+        while True:
+            await asyncio.sleep(self.fallback_after)
+            self._expire(time.monotonic())
+            deadline = time.monotonic() - self.fallback_after
+            stale = sorted(
+                (key for key, at in self._registered_at.items() if at <= deadline),
+                key=self._registered_at.get,
+            )[:self.max_fallback_queries]
+            if not stale:
+                continue
+            now = time.monotonic()
+            for key in stale:
+                self._registered_at[key] = now
+            results = await asyncio.gather(
+                *[self.client.get_tx_by_hash("0x" + key) for key in stale],
+                return_exceptions=True,
+            )
+            for key, result in zip(stale, results):
+                if isinstance(result, grpc.RpcError):
+                    # not indexed yet, retry on the next sweep
+                    continue
+                if isinstance(result, Exception):
+                    logger.warning("GetTxByTxHash for %s failed: %s", key, result)
+                    continue
+                if not result.hash:
+                    continue
+                self._resolve(key, result)
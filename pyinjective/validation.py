@@ -0,0 +1,116 @@
+"""Pre-trade checks of orders against market rules."""
+
+from decimal import Decimal, InvalidOperation
+from typing import List, NamedTuple, Optional
+
+from .constant import Denom
+
+
+DEC_ONE = Decimal(10) ** 18
+
+
+class OrderViolation(NamedTuple):
+    field: str
+    reason: str
+    message: str
+
+
+def _decimal(value) -> Optional[Decimal]:
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def _check_tick(field: str, value: Decimal, exponent: int, tick, violations: List[OrderViolation]):
+    chain_value = value * Decimal(10) ** (18 + exponent)
+    chain_tick = Decimal(str(tick)) * DEC_ONE
+    if chain_tick and chain_value % chain_tick != 0:
+        violations.append(OrderViolation(field, "tick_size", "{} {} is not a multiple of the tick size".format(field, value)))
+
+
+def _check_common(
+    price,
+    quantity,
+    price_exponent: int,
+    quantity_exponent: int,
+    denom: Denom,
+    min_notional,
+) -> List[OrderViolation]:
+    violations = []
+    price, quantity = _decimal(price), _decimal(quantity)
+    if price is None or price <= 0:
+        violations.append(OrderViolation("price", "not_positive", "price must be a positive number"))
+    else:
+        _check_tick("price", price, price_exponent, denom.min_price_tick_size, violations)
+    if quantity is None or quantity <= 0:
+        violations.append(OrderViolation("quantity", "not_positive", "quantity must be a positive number"))
+    else:
+        _check_tick("quantity", quantity, quantity_exponent, denom.min_quantity_tick_size, violations)
+    if not violations and min_notional is not None and price * quantity < _decimal(min_notional):
+        violations.append(OrderViolation(
+            "quantity", "min_notional", "notional {} is below the minimum {}".format(price * quantity, min_notional)))
+    return violations
+
+
+def validate_spot_order(denom: Denom, price, quantity, min_notional=None) -> List[OrderViolation]:
+    """
+    :param denom: market metadata, see Denom.load_market
+    :param min_notional: smallest accepted price * quantity in quote units, not checked when None
+    """
+    return _check_common(price, quantity, denom.quote - denom.base, denom.base, denom, min_notional)
+
+
+def validate_derivative_order(
+    denom: Denom,
+    price,
+    quantity,
+    is_buy: bool,
+    leverage=None,
+    is_reduce_only: bool = None,
+    min_notional=None,
+    initial_margin_ratio=None,
+    position=None,
+    available_balance=None,
+) -> List[OrderViolation]:
+    """
+    :param denom: market metadata, see Denom.load_market
+    :param leverage: leverage the margin is derived from, required unless reduce-only
+    :param is_reduce_only: same meaning as in Composer.DerivativeOrder
+    :param min_notional: smallest accepted price * quantity in quote units, not checked when None
+    :param initial_margin_ratio: market initial margin ratio, caps the leverage when given
+    :param position: the subaccount's position in the market (anything with ``direction``
+        and a human ``quantity``), checked against reduce-only orders when given
+    :param available_balance: quote balance available for margin, when given
+    """
+    violations = _check_common(price, quantity, denom.quote, denom.base, denom, min_notional)
+    if violations:
+        return violations
+    price, quantity = _decimal(price), _decimal(quantity)
+
+    if is_reduce_only:
+        if position is not None:
+            closes = (position.direction == "short") == is_buy
+            if not closes:
+                violations.append(OrderViolation(
+                    "is_reduce_only", "no_opposing_position", "reduce-only order does not reduce the {} position".format(position.direction)))
+            elif quantity > _decimal(position.quantity):
+                violations.append(OrderViolation(
+                    "quantity", "exceeds_position", "reduce-only quantity {} exceeds the position {}".format(quantity, position.quantity)))
+        return violations
+
+    leverage = _decimal(leverage) if leverage is not None else None
+    if leverage is None or leverage <= 0:
+        violations.append(OrderViolation("leverage", "not_positive", "leverage must be a positive number"))
+        return violations
+    if initial_margin_ratio is not None:
+        max_leverage = 1 / _decimal(initial_margin_ratio)
+        if leverage > max_leverage:
+            violations.append(OrderViolation(
+                "leverage", "exceeds_max_leverage", "leverage {} exceeds the market maximum {:.2f}".format(leverage, max_leverage)))
+    if available_balance is not None:
+        margin = price * quantity / leverage
+        if margin > _decimal(available_balance):
+            violations.append(OrderViolation(
+                "leverage", "insufficient_margin", "margin {} exceeds the available balance {}".format(margin, available_balance)))
+    return violations
@@ -1,4 +1,5 @@
 import sys
+import threading
 import sha3
 import hashlib
 import bech32
@@ -9,9 +10,10 @@ from typing import Tuple
 from bech32 import bech32_encode, bech32_decode, convertbits
 from bip32 import BIP32
 from ecdsa import SigningKey, VerifyingKey, SECP256k1, BadSignatureError
-from ecdsa.util import sigencode_string_canonize
+from ecdsa.util import sigencode_string_canonize, sigdecode_string
 from mnemonic import Mnemonic
 
+from .eip712 import hash_typed_data
 from .exceptions import ConvertError, DecodeError
 from .proto.injective.crypto.v1beta1.ethsecp256k1.keys_pb2 import PubKey as PubKeyProto
 
@@ -102,6 +104,25 @@ class PrivateKey:
         # return self.signing_key.sign_deterministic(msg, hashfunc=hashlib.sha256, sigencode=sigencode_string_canonize)
         return self.signing_key.sign_deterministic(msg, hashfunc=sha3.keccak_256, sigencode=sigencode_string_canonize)
 
+    def sign_typed_data(self, typed_data: dict) -> bytes:
+        """
+        Sign an EIP-712 typed data document, e.g. the one returned by the exchange API PrepareTx.
+
+        :param typed_data: the decoded EIP-712 JSON document
+
+        :return: a 65 bytes r || s || v signature, v being 27 or 28
+        """
+        digest = hash_typed_data(typed_data)
+        sig = self.signing_key.sign_digest_deterministic(
+            digest, hashfunc=hashlib.sha256, sigencode=sigencode_string_canonize
+        )
+        candidates = VerifyingKey.from_public_key_recovery_with_digest(
+            sig, digest, SECP256k1, hashfunc=hashlib.sha256, sigdecode=sigdecode_string
+        )
+        own_key = self.signing_key.get_verifying_key().to_string()
+        recovery_id = next(i for i, key in enumerate(candidates) if key.to_string() == own_key)
+        return sig + bytes([27 + recovery_id])
+
 
 class PublicKey:
     """
@@ -206,10 +227,21 @@ class Address:
         self.addr = addr
         self.number = 0
         self.sequence = 0
+        self._sequence_lock = threading.Lock()
 
     def __eq__(self, o: "Address") -> bool:
         return self.addr == o.addr
 
+    def __getstate__(self) -> dict:
+        # locks cannot be pickled
+        state = self.__dict__.copy()
+        del state["_sequence_lock"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._sequence_lock = threading.Lock()
+
     @classmethod
     def _from_bech32(cls, bech: str, prefix: str) -> "Address":
         hrp, bz = bech32_decode(bech)
@@ -291,9 +323,10 @@ class Address:
         return self
 
     def get_sequence(self):
-        current_seq = self.sequence
-        self.sequence += 1
-        return current_seq
+        with self._sequence_lock:
+            current_seq = self.sequence
+            self.sequence += 1
+            return current_seq
         
     def get_number(self):
         return self.number
@@ -0,0 +1,64 @@
+import pytest
+
+from pyinjective.eip712 import encode_type, hash_struct, hash_typed_data, type_hash
+
+# the example of the EIP-712 specification, https://eips.ethereum.org/EIPS/eip-712
+MAIL = {
+    "types": {
+        "EIP712Domain": [
+            {"name": "name", "type": "string"},
+            {"name": "version", "type": "string"},
+            {"name": "chainId", "type": "uint256"},
+            {"name": "verifyingContract", "type": "address"},
+        ],
+        "Person": [
+            {"name": "name", "type": "string"},
+            {"name": "wallet", "type": "address"},
+        ],
+        "Mail": [
+            {"name": "from", "type": "Person"},
+            {"name": "to", "type": "Person"},
+            {"name": "contents", "type": "string"},
+        ],
+    },
+    "primaryType": "Mail",
+    "domain": {
+        "name": "Ether Mail",
+        "version": "1",
+        "chainId": 1,
+        "verifyingContract": "0xCcCCccccCCCCcCCCCCCcCcCccCcCCCcCcccccccC",
+    },
+    "message": {
+        "from": {"name": "Cow", "wallet": "0xCD2a3d9F938E13CD947Ec05AbC7FE734Df8DD826"},
+        "to": {"name": "Bob", "wallet": "0xbBbBBBBbbBBBbbbBbbBbbbbBBbBbbbbBbBbbBBbB"},
+        "contents": "Hello, Bob!",
+    },
+}
+
+
+def test_encode_type_appends_dependencies():
+    assert encode_type("Mail", MAIL["types"]) == "Mail(Person from,Person to,string contents)Person(string name,address wallet)"
+
+
+def test_mail_type_hash():
+    assert type_hash("Mail", MAIL["types"]).hex() == "a0cedeb2dc280ba39b857546d74f5549c3a1d7bdc2dd96bf881f76108e23dac2"
+
+
+def test_mail_domain_separator():
+    digest = hash_struct("EIP712Domain", MAIL["domain"], MAIL["types"])
+    assert digest.hex() == "f2cee375fa42b42143804025fc449deafd50cc031ca257e0b194a650a912090f"
+
+
+def test_mail_struct_hash():
+    digest = hash_struct("Mail", MAIL["message"], MAIL["types"])
+    assert digest.hex() == "c52c0ee5d84264471806290a3f2c4cecfc5490626bf912d01f240d7a274b371e"
+
+
+def test_mail_digest():
+    assert hash_typed_data(MAIL).hex() == "be609aee343fb3c4b28e1df9e632fca64fcfaede20f02e86244efddf30957bd2"
+
+
+def test_bytes_must_be_hex():
+    types = {"Salted": [{"name": "salt", "type": "bytes32"}]}
+    with pytest.raises(ValueError):
+        hash_struct("Salted", {"salt": "not hex"}, types)
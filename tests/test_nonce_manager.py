@@ -0,0 +1,106 @@
+import multiprocessing
+
+import pytest
+
+from pyinjective.exceptions import NotFoundError
+from pyinjective.nonce_manager import AccountNonceState, FileNonceBackend, NonceManager
+
+ADDRESS = "inj1test"
+
+
+def test_allocate_is_sequential():
+    state = AccountNonceState(next_sequence=5)
+    assert [state.allocate() for _ in range(3)] == [5, 6, 7]
+    assert state.pending == {5, 6, 7}
+    assert state.next_sequence == 8
+
+
+def test_released_sequences_are_reused_first():
+    state = AccountNonceState(next_sequence=5)
+    for _ in range(3):
+        state.allocate()
+    state.release(7)
+    state.release(6)
+    assert state.gaps == [6, 7]
+    assert state.allocate() == 6
+    assert state.allocate() == 7
+    assert state.allocate() == 8
+
+
+def test_release_ignores_unknown_sequences():
+    state = AccountNonceState(next_sequence=5)
+    state.release(3)
+    assert state.gaps == []
+
+
+def test_confirm_drops_pending_and_gaps_below():
+    state = AccountNonceState(next_sequence=5)
+    for _ in range(4):
+        state.allocate()
+    state.release(5)
+    state.confirm(6)
+    assert state.pending == {7, 8}
+    assert state.gaps == []
+    assert state.allocate() == 9
+
+
+def test_confirm_advances_past_an_external_sequence():
+    state = AccountNonceState(next_sequence=5)
+    state.confirm(10)
+    assert state.allocate() == 11
+
+
+def test_reset_takes_the_chain_value_when_nothing_is_in_flight():
+    state = AccountNonceState(next_sequence=9, gaps=[7])
+    state.reset(4)
+    assert state.next_sequence == 4
+    assert state.gaps == []
+
+
+def test_reset_keeps_in_flight_sequences():
+    state = AccountNonceState(next_sequence=5)
+    for _ in range(3):
+        state.allocate()
+    state.reset(6)
+    assert state.pending == {6, 7}
+    assert state.allocate() == 8
+
+
+def test_state_round_trips_through_dict():
+    state = AccountNonceState(next_sequence=3, pending=[1, 2], gaps=[0])
+    assert AccountNonceState.from_dict(state.to_dict()).to_dict() == state.to_dict()
+
+
+def test_unknown_account_raises():
+    with pytest.raises(NotFoundError):
+        NonceManager().allocate(ADDRESS)
+
+
+def test_file_backend_unknown_account_raises(tmp_path):
+    manager = NonceManager(FileNonceBackend(str(tmp_path)))
+    with pytest.raises(NotFoundError):
+        manager.allocate(ADDRESS)
+    assert manager.state(ADDRESS) is None
+
+
+def _allocate_many(directory: str, count: int, queue):
+    manager = NonceManager(FileNonceBackend(directory))
+    queue.put([manager.allocate(ADDRESS) for _ in range(count)])
+
+
+def test_file_backend_shares_sequences_between_processes(tmp_path):
+    directory = str(tmp_path)
+    NonceManager(FileNonceBackend(directory)).init(ADDRESS, 100)
+
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    workers = [ctx.Process(target=_allocate_many, args=(directory, 50, queue)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    allocated = queue.get(timeout=60) + queue.get(timeout=60)
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+
+    assert sorted(allocated) == list(range(100, 200))
+    assert NonceManager(FileNonceBackend(directory)).state(ADDRESS).next_sequence == 200
@@ -0,0 +1,82 @@
+from decimal import Decimal
+
+from pyinjective.orderbook import OrderBook, OrderBookSide, dec_to_int, int_to_dec
+from pyinjective.proto.exchange import injective_spot_exchange_rpc_pb2 as spot_exchange_rpc_pb
+
+ONE = 10 ** 18
+
+
+def test_dec_to_int():
+    assert dec_to_int("1.5") == 15 * 10 ** 17
+    assert dec_to_int("-0.25") == -25 * 10 ** 16
+    assert dec_to_int(".5") == 5 * 10 ** 17
+    assert dec_to_int("1e-18") == 1
+    assert dec_to_int("0.1234567890123456789") == 123456789012345678
+    assert int_to_dec(15 * 10 ** 17) == Decimal("1.5")
+
+
+def test_update_inserts_in_price_order():
+    bids = OrderBookSide(is_buy=True)
+    for price in (3, 1, 2):
+        bids.update(price, 10)
+    asks = OrderBookSide(is_buy=False)
+    for price in (5, 7, 6):
+        asks.update(price, 10)
+    assert [price for price, _ in bids.depth()] == [3, 2, 1]
+    assert [price for price, _ in asks.depth()] == [5, 6, 7]
+    assert bids.best() == (3, 10)
+    assert asks.best() == (5, 10)
+
+
+def test_update_replaces_and_deletes_levels():
+    side = OrderBookSide(is_buy=True)
+    side.update(1, 10)
+    side.update(2, 20)
+    side.update(2, 25)
+    assert side.quantity_at(2) == 25
+    side.update(2, 0)
+    assert side.quantity_at(2) == 0
+    assert side.depth() == [(1, 10)]
+    # deleting a missing level is a no-op
+    side.update(5, 0)
+    assert len(side) == 1
+
+
+def test_volume_and_levels_better_than():
+    asks = OrderBookSide(is_buy=False)
+    asks.replace([(7, 1), (5, 2), (6, 3), (8, 0)])
+    assert len(asks) == 3
+    assert asks.volume(6) == 5
+    assert asks.slice(6) == [(5, 2), (6, 3)]
+    assert asks.levels_better_than(7) == 2
+    assert asks.depth(2) == [(5, 2), (6, 3)]
+
+
+def test_apply_snapshot_and_stream_update():
+    book = OrderBook("0xmarket")
+    snapshot = spot_exchange_rpc_pb.SpotLimitOrderbook(
+        buys=[spot_exchange_rpc_pb.PriceLevel(price="1.0", quantity="2")],
+        sells=[
+            spot_exchange_rpc_pb.PriceLevel(price="1.2", quantity="1"),
+            spot_exchange_rpc_pb.PriceLevel(price="1.1", quantity="3"),
+        ],
+    )
+    book.apply_snapshot(snapshot, timestamp=1)
+    assert book.best_bid() == (ONE, 2 * ONE)
+    assert book.best_ask() == (11 * ONE // 10, 3 * ONE)
+    assert book.spread() == ONE // 10
+    assert book.mid_price() == 105 * ONE // 100
+
+    update = spot_exchange_rpc_pb.StreamOrderbookResponse(
+        orderbook=spot_exchange_rpc_pb.SpotLimitOrderbook(
+            buys=[spot_exchange_rpc_pb.PriceLevel(price="1.05", quantity="1")],
+        ),
+        timestamp=2,
+        market_id="0xmarket",
+    )
+    book.apply(update)
+    assert book.best_bid() == (105 * ONE // 100, ONE)
+    assert book.best_ask() is None
+    assert book.spread() is None
+    assert book.timestamp == 2
+    assert book.sequence == 2
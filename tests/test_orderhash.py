@@ -0,0 +1,110 @@
+import asyncio
+
+from pyinjective.orderhash import OrderHashManager, compute_order_hash
+from pyinjective.proto.injective.exchange.v1beta1 import exchange_pb2 as exchange_pb
+
+SUBACCOUNT_ID = "0xaf79152ac5df276d9a8e1e2e22822f9713474902000000000000000000000000"
+FEE_RECIPIENT = "inj14au322k9munkmx5wrchz9q30juf5wjgz2cfqku"
+
+SPOT_ORDER = exchange_pb.SpotOrder(
+    market_id="0x0611780ba69656949525013d947713300f56c37b6175e02f26bffa495c3208fe",
+    order_info=exchange_pb.OrderInfo(
+        subaccount_id=SUBACCOUNT_ID,
+        fee_recipient=FEE_RECIPIENT,
+        price="524000000000000000",
+        quantity="10000000000000000",
+    ),
+    order_type=exchange_pb.OrderType.BUY,
+    trigger_price="0",
+)
+DERIVATIVE_ORDER = exchange_pb.DerivativeOrder(
+    market_id="0x4ca0f92fc28be0c9761326016b5a1a2177dd6375558365116b5bdda9abc229ce",
+    order_info=exchange_pb.OrderInfo(
+        subaccount_id=SUBACCOUNT_ID,
+        fee_recipient=FEE_RECIPIENT,
+        price="10500000000000000000000",
+        quantity="10000000000000000",
+    ),
+    order_type=exchange_pb.OrderType.SELL,
+    margin="105000000000000000000",
+    trigger_price="0",
+)
+
+# hashes of the orders above as computed by the eip712 package based OrderHashManager of injective-py 1.0
+SPOT_HASH_1 = "0x94bfd5e00506355da0a5ba15179568077afddfd9caa3fbac56580e7a367f215f"
+SPOT_HASH_2 = "0xb892a4eb81214b603478aacaecca92ea0c44b0e2631e4cc188dcd26b5b6d157c"
+DERIVATIVE_HASH_3 = "0x01ca8c93338dbffe0b44950913119e576e2296680ef7b9e722f9544653495845"
+
+
+class Client:
+    def __init__(self, nonce: int):
+        self.nonce = nonce
+        self.queries = 0
+
+    async def get_subaccount_trade_nonce(self, subaccount_id: str) -> int:
+        self.queries += 1
+        return self.nonce
+
+
+class TxData:
+    def __init__(self, code: int = 0, block_number: int = 0):
+        self.code = code
+        self.block_number = block_number
+
+
+def test_compute_order_hash():
+    assert compute_order_hash(SPOT_ORDER, 1) == SPOT_HASH_1
+    assert compute_order_hash(SPOT_ORDER, 2) == SPOT_HASH_2
+    assert compute_order_hash(DERIVATIVE_ORDER, 3) == DERIVATIVE_HASH_3
+
+
+def test_batch_reserves_consecutive_nonces():
+    async def main():
+        manager = OrderHashManager(Client(0), SUBACCOUNT_ID)
+        hashes = await manager.compute_order_hashes([SPOT_ORDER, SPOT_ORDER], [DERIVATIVE_ORDER])
+        assert hashes == [SPOT_HASH_1, SPOT_HASH_2, DERIVATIVE_HASH_3]
+        assert (manager.nonce, manager.reserved) == (0, 3)
+
+    asyncio.run(main())
+
+
+def test_settle_advances_on_inclusion():
+    async def main():
+        client = Client(0)
+        manager = OrderHashManager(client, SUBACCOUNT_ID)
+        await manager.compute_order_hashes([SPOT_ORDER, SPOT_ORDER])
+        await manager.compute_order_hashes(derivative_orders=[DERIVATIVE_ORDER])
+        await manager.settle(2, TxData(block_number=10))
+        assert (manager.nonce, manager.reserved) == (2, 1)
+        await manager.settle(1, TxData(block_number=11))
+        assert (manager.nonce, manager.reserved) == (3, 0)
+        assert client.queries == 1
+
+    asyncio.run(main())
+
+
+def test_settle_resyncs_on_failure():
+    async def main():
+        client = Client(0)
+        manager = OrderHashManager(client, SUBACCOUNT_ID)
+        await manager.compute_order_hashes([SPOT_ORDER, SPOT_ORDER])
+        await manager.settle(2, TxData(code=5, block_number=10))
+        assert (manager.nonce, manager.reserved) == (0, 0)
+        client.nonce = 7
+        await manager.settle(1, RuntimeError("broadcast failed"))
+        assert (manager.nonce, manager.reserved) == (7, 0)
+        assert client.queries == 3
+
+    asyncio.run(main())
+
+
+def test_confirm_before_sync():
+    async def main():
+        client = Client(4)
+        manager = OrderHashManager(client, SUBACCOUNT_ID)
+        manager.confirm(2)
+        assert manager.nonce is None
+        await manager.settle(2, TxData(block_number=10))
+        assert manager.nonce == 4
+
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+import asyncio
+
+from pyinjective.pagination import paginate
+
+
+class History:
+    """Newest-first history served by offset, like the explorer and exchange API history RPCs."""
+
+    def __init__(self, count: int):
+        self.items = list(range(count, 0, -1))
+        self.calls = []
+
+    async def fetch_page(self, skip: int, limit: int):
+        self.calls.append(skip)
+        await asyncio.sleep(0)
+        return self.items[skip:skip + limit]
+
+
+def collect(history: History, **kwargs):
+    async def main():
+        return [item async for item in paginate(history.fetch_page, **kwargs)]
+
+    return asyncio.run(main())
+
+
+def test_all_pages_in_order():
+    history = History(25)
+    assert collect(history, page_size=10, prefetch=2) == list(range(25, 0, -1))
+    # the short third page stops the iteration, prefetched pages past it are dropped
+    assert history.calls[:3] == [0, 10, 20]
+
+
+def test_empty_history():
+    history = History(0)
+    assert collect(history, page_size=10, prefetch=0) == []
+    assert history.calls == [0]
+
+
+def test_dedupe_when_new_items_shift_the_pages():
+    history = History(30)
+    fetch_page = history.fetch_page
+
+    async def shifting_fetch_page(skip: int, limit: int):
+        page = await fetch_page(skip, limit)
+        if skip == 0:
+            # five new entries arrive at the head after the first page was read
+            history.items[:0] = list(range(35, 30, -1))
+        return page
+
+    async def main():
+        return [item async for item in paginate(shifting_fetch_page, page_size=10, prefetch=0, key=lambda item: item)]
+
+    assert asyncio.run(main()) == list(range(30, 0, -1))
+
+
+def test_without_key_shifted_items_repeat():
+    history = History(20)
+    fetch_page = history.fetch_page
+
+    async def shifting_fetch_page(skip: int, limit: int):
+        page = await fetch_page(skip, limit)
+        if skip == 0:
+            history.items[:0] = [22, 21]
+        return page
+
+    async def main():
+        return [item async for item in paginate(shifting_fetch_page, page_size=10, prefetch=0)]
+
+    items = asyncio.run(main())
+    assert items[10:12] == [12, 11]
+    assert len(items) == 22
+
+
+def test_prefetch_stays_bounded():
+    history = History(100)
+
+    async def main():
+        async for item in paginate(history.fetch_page, page_size=10, prefetch=3):
+            if item == 95:
+                break
+        await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+    # the page being consumed plus three ahead of it, nothing fetched after the break
+    assert history.calls == [0, 10, 20, 30, 40]
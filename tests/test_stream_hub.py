@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from pyinjective.exceptions import SlowConsumerError
+from pyinjective.streams import DISCONNECT, DROP_OLDEST, StreamHub
+
+
+class Upstream:
+    """Endless stream of (name, n) messages, one per ``interval`` seconds."""
+
+    def __init__(self, name: str, interval: float = 0.001, count: int = None):
+        self.name = name
+        self.interval = interval
+        self.count = count
+        self.cancelled = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        n = 0
+        while self.count is None or n < self.count:
+            await asyncio.sleep(self.interval)
+            n += 1
+            yield self.name, n
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 5))
+
+
+def test_subscribers_share_one_upstream():
+    async def main():
+        hub = StreamHub()
+        opened = []
+
+        def open_upstream():
+            opened.append(Upstream("a", count=3))
+            return opened[-1]
+
+        first = hub.subscribe("k", open_upstream)
+        second = hub.subscribe("k", open_upstream)
+        assert hub.subscriber_count("k") == 2
+        assert [msg async for msg in first] == [("a", 1), ("a", 2), ("a", 3)]
+        assert [msg async for msg in second] == [("a", 1), ("a", 2), ("a", 3)]
+        assert len(opened) == 1
+        assert hub.subscriber_count("k") == 0
+
+    run(main())
+
+
+def test_last_cancel_closes_the_upstream():
+    async def main():
+        hub = StreamHub()
+        upstream = Upstream("a")
+        sub = hub.subscribe("k", lambda: upstream)
+        await sub.__anext__()
+        sub.cancel()
+        assert upstream.cancelled
+        with pytest.raises(StopAsyncIteration):
+            await sub.__anext__()
+        await hub.close()
+
+    run(main())
+
+
+def test_resubscribe_while_the_old_pump_finishes():
+    async def main():
+        hub = StreamHub()
+        old = hub.subscribe("k", lambda: Upstream("a"))
+        assert await old.__anext__() == ("a", 1)
+        old.cancel()
+        # the cancelled pump has not run its cleanup yet
+        new = hub.subscribe("k", lambda: Upstream("b"))
+        assert await new.__anext__() == ("b", 1)
+        await asyncio.sleep(0.01)
+        assert hub.subscriber_count("k") == 1
+        assert await new.__anext__() is not None
+        new.cancel()
+        await hub.close()
+
+    run(main())
+
+
+def test_drop_oldest_keeps_the_newest_messages():
+    async def main():
+        hub = StreamHub()
+        sub = hub.subscribe("k", lambda: Upstream("a", count=5), maxsize=2, policy=DROP_OLDEST)
+        await asyncio.sleep(0.05)
+        assert [msg async for msg in sub] == [("a", 4), ("a", 5)]
+        assert sub.dropped == 3
+
+    run(main())
+
+
+def test_disconnect_ends_a_slow_subscriber():
+    async def main():
+        hub = StreamHub()
+        slow = hub.subscribe("k", lambda: Upstream("a"), maxsize=2, policy=DISCONNECT)
+        fast = hub.subscribe("k", lambda: Upstream("a"), maxsize=100)
+        await asyncio.sleep(0.05)
+        with pytest.raises(SlowConsumerError):
+            async for _ in slow:
+                pass
+        assert hub.subscriber_count("k") == 1
+        assert await fast.__anext__() == ("a", 1)
+        await hub.close()
+
+    run(main())
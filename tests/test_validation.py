@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+from pyinjective.constant import Denom
+from pyinjective.validation import validate_derivative_order, validate_spot_order
+
+# INJ/USDT: 18 and 6 decimals, ticks of 0.001 USDT and 0.001 INJ in human units
+SPOT = Denom("INJ/USDT", 18, 6, 0.000000000000001, 1000000000000000)
+# a perpetual quoted in USDT: ticks of 0.001 USDT and 0.0001 contracts
+DERIVATIVE = Denom("BTC/USDT PERP", 0, 6, 1000, 0.0001)
+
+
+def _reasons(violations):
+    return [(violation.field, violation.reason) for violation in violations]
+
+
+def test_spot_order_on_ticks():
+    assert validate_spot_order(SPOT, "1.234", "0.5") == []
+    assert validate_spot_order(SPOT, 1.234, 0.5) == []
+
+
+def test_spot_order_off_ticks():
+    assert _reasons(validate_spot_order(SPOT, "1.2345", "0.0015")) == [
+        ("price", "tick_size"),
+        ("quantity", "tick_size"),
+    ]
+
+
+def test_spot_order_not_positive():
+    assert _reasons(validate_spot_order(SPOT, "0", "abc")) == [
+        ("price", "not_positive"),
+        ("quantity", "not_positive"),
+    ]
+
+
+def test_spot_order_min_notional():
+    assert _reasons(validate_spot_order(SPOT, "1", "0.001", min_notional=1)) == [("quantity", "min_notional")]
+    assert validate_spot_order(SPOT, "1", "1", min_notional=1) == []
+
+
+def test_derivative_order_ticks():
+    assert validate_derivative_order(DERIVATIVE, "10.5", "0.0002", is_buy=True, leverage=2) == []
+    assert _reasons(validate_derivative_order(DERIVATIVE, "10.0005", "0.00015", is_buy=True, leverage=2)) == [
+        ("price", "tick_size"),
+        ("quantity", "tick_size"),
+    ]
+
+
+def test_derivative_order_leverage():
+    assert _reasons(validate_derivative_order(DERIVATIVE, "10", "1", is_buy=True)) == [("leverage", "not_positive")]
+    assert _reasons(
+        validate_derivative_order(DERIVATIVE, "10", "1", is_buy=True, leverage=25, initial_margin_ratio="0.05")
+    ) == [("leverage", "exceeds_max_leverage")]
+    assert _reasons(
+        validate_derivative_order(DERIVATIVE, "10", "1", is_buy=True, leverage=2, available_balance="4")
+    ) == [("leverage", "insufficient_margin")]
+
+
+def test_derivative_reduce_only():
+    long = SimpleNamespace(direction="long", quantity="1")
+    assert validate_derivative_order(DERIVATIVE, "10", "1", is_buy=False, is_reduce_only=True, position=long) == []
+    assert _reasons(
+        validate_derivative_order(DERIVATIVE, "10", "2", is_buy=False, is_reduce_only=True, position=long)
+    ) == [("quantity", "exceeds_position")]
+    assert _reasons(
+        validate_derivative_order(DERIVATIVE, "10", "1", is_buy=True, is_reduce_only=True, position=long)
+    ) == [("is_reduce_only", "no_opposing_position")]